@@ -7,11 +7,22 @@ Description: Main application file for ArenaVSRS.
 License: MIT License
 """
 
+import uvicorn
 import gradio as gr
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 # Importing necessary components for the Gradio app
 from app.config import CONFIG_NAME, config_data, load_tab_creators
+from app.data_init import data_context
 from app.event_handlers.event_handlers import setup_app_event_handlers
+from app.metrics import (
+    render_cache_metrics,
+    render_coverage_metrics,
+    render_metrics,
+    render_readiness_metrics,
+)
+from app.prefork import PreforkServer
 import app.tabs
 
 
@@ -42,5 +53,77 @@ def create_gradio_app() -> gr.Blocks:
     return gradio_app
 
 
+def create_server_app() -> FastAPI:
+    server_app = FastAPI()
+
+    def metrics() -> PlainTextResponse:
+        content = (
+            render_metrics()
+            + render_cache_metrics(data_context.render_cache.stats())
+            + render_coverage_metrics(data_context.scheduler.coverage())
+            + render_readiness_metrics(data_context.status())
+        )
+
+        return PlainTextResponse(content, media_type="text/plain; version=0.0.4")
+
+    # Метрики в формате Prometheus отдаются тем же сервером, что и интерфейс
+    server_app.add_api_route(
+        config_data.Metrics_PATH,
+        metrics,
+        methods=["GET"],
+        include_in_schema=False,
+    )
+
+    def ready() -> JSONResponse:
+        status = data_context.status()
+
+        return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+    # Проверка готовности для балансировщика: 503, пока данные загружаются или загрузка не удалась
+    server_app.add_api_route(
+        config_data.Metrics_READY_PATH,
+        ready,
+        methods=["GET"],
+        include_in_schema=False,
+    )
+
+    def item_statistics() -> JSONResponse:
+        return JSONResponse(data_context.item_statistics.export())
+
+    # Статистика по каждой вакансии отдается отдельно в JSON: число меток в Prometheus
+    # росло бы вместе с корпусом
+    if config_data.Metrics_ITEM_STATISTICS:
+        server_app.add_api_route(
+            config_data.Metrics_ITEM_STATISTICS_PATH,
+            item_statistics,
+            methods=["GET"],
+            include_in_schema=False,
+        )
+
+    gradio_app = create_gradio_app().queue(
+        api_open=False,
+        max_size=config_data.Concurrency_MAX_SIZE,
+        default_concurrency_limit=config_data.Concurrency_DEFAULT_LIMIT,
+    )
+
+    return gr.mount_gradio_app(server_app, gradio_app, path="/")
+
+
+def serve(host: str, port: int) -> None:
+    uvicorn.run(create_server_app(), host=host, port=port)
+
+
 if __name__ == "__main__":
-    create_gradio_app().queue(api_open=False).launch(server_name="0.0.0.0", share=False)
+    if config_data.Workers_COUNT == 1:
+        # Сервер запускается сразу, а данные загружаются в фоновом потоке
+        data_context.start()
+
+        serve(config_data.AppSettings_SERVER_NAME, config_data.AppSettings_SERVER_PORT)
+    else:
+        PreforkServer(
+            data_context,
+            serve,
+            host=config_data.Workers_HOST,
+            workers=config_data.Workers_COUNT,
+            base_port=config_data.Workers_BASE_PORT,
+        ).run()
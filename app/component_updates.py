@@ -0,0 +1,166 @@
+"""
+File: component_updates.py
+Author: Dmitry Ryumin
+Description: Delta updates of the Gradio components returned by the event handlers.
+License: MIT License
+"""
+
+import gradio as gr
+from typing import Any, Dict, List, Optional
+
+# Importing necessary components for the Gradio app
+from app.config import config_data
+from app.components import html_message_value
+from app.description_steps import get_step_2
+from app.rating_utils import count_rows_to_evaluate
+from app.utils import randomize_results
+
+
+def dataframe_value(values: Any, headers: List[str]) -> Dict[str, Any]:
+    """
+    Значение датафрейма вместе с заголовками, которые меняются при случайном порядке результатов
+
+    Args:
+        values (Any): Строки датафрейма
+        headers (List[str]): Заголовки столбцов
+
+    Returns:
+        Dict[str, Any]: Значение для gr.Dataframe
+    """
+
+    return {"data": values if values else [[]], "headers": headers}
+
+
+def vacancy_updates(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Обновления компонентов вакансии и результатов А и Б. Передаются только значения,
+    которые зависят от вакансии: подписи, варианты оценок, иконки и классы компонентов
+    задаются один раз при построении интерфейса
+
+    Args:
+        payload (Dict[str, Any]): Данные вакансии из DataContext.get_vacancy_payload
+
+    Returns:
+        Dict[str, Any]: Название компонента -> значение или gr.update
+    """
+
+    state = {
+        "random_order": None,
+        "dataframe_a": payload["dataframe_a"],
+        "dataframe_b": payload["dataframe_b"],
+    }
+
+    dataframe_a, headers_a, dataframe_b, headers_b = randomize_results(
+        config_data, state
+    )
+
+    key_skills = payload["key_skills"]
+    noti_keyskills_visible = key_skills is None
+
+    return {
+        "csv_vsa_file": payload["source_file"],
+        "vacancy_id": payload["ID"],
+        "vacancy_name": payload["Name"],
+        "vacancy_description": payload["Description"],
+        "dropdown_keyskills": gr.update(
+            info=config_data.InformationMessages_DROPDOWN_KEYSKILLS.format(
+                len(key_skills) if isinstance(key_skills, list) else 0
+            ),
+            choices=key_skills,
+            value=key_skills,
+            visible=not noti_keyskills_visible,
+        ),
+        "noti_keyskills": gr.update(visible=noti_keyskills_visible),
+        "res_a": dataframe_value(dataframe_a, headers_a),
+        "res_b": dataframe_value(dataframe_b, headers_b),
+    }
+
+
+def rating_reset_updates() -> Dict[str, Any]:
+    """
+    Обновления компонентов оценки для новой вакансии: сброс оценок, кнопка недоступна
+
+    Returns:
+        Dict[str, Any]: Название компонента -> значение или gr.update
+    """
+
+    return {
+        "dropdown_rating_a": None,
+        "dropdown_rating_b": None,
+        "calculate_rating": gr.update(interactive=False, visible=True),
+        "notifications_calculate": gr.update(
+            value=html_message_value(
+                config_data.InformationMessages_NOTI_CALCULATE_RATING[0], error=True
+            ),
+            visible=True,
+        ),
+    }
+
+
+def no_vacancy_updates() -> Dict[str, Any]:
+    """
+    Обновления компонентов вакансии и оценки, когда пользователю больше нечего оценивать:
+    вакансия и оценки скрываются, вместо них показывается сообщение
+
+    Returns:
+        Dict[str, Any]: Название компонента -> значение или gr.update
+    """
+
+    return {
+        "csv_vsa_file": "",
+        "vacancy_id": "",
+        "vacancy_name": gr.update(value="", visible=False),
+        "vacancy_description": gr.update(value="", visible=False),
+        "dropdown_keyskills": gr.update(choices=[], value=[], visible=False),
+        "noti_keyskills": gr.update(visible=False),
+        "res_a": gr.update(visible=False),
+        "res_b": gr.update(visible=False),
+        "dropdown_rating_a": gr.update(value=None, visible=False),
+        "dropdown_rating_b": gr.update(value=None, visible=False),
+        "calculate_rating": gr.update(interactive=False, visible=False),
+        "notifications_calculate": gr.update(
+            value=html_message_value(
+                config_data.InformationMessages_NOTI_NO_VACANCIES, error=False
+            ),
+            visible=True,
+        ),
+    }
+
+
+def step_2_update(
+    corpus: Any,
+    ratings_ledger: Any,
+    surname: str,
+    username: str,
+    affiliation: str,
+) -> Dict[str, Any]:
+    """
+    Обновление заголовка шага оценки. При выдаче вакансий по очереди (Scheduler.MODE = round_robin)
+    в заголовке показывается, сколько вакансий пользователю осталось оценить. Другие режимы
+    распределяют вакансии между участниками, и количество заранее не известно
+
+    Args:
+        corpus (Any): Набор данных (CorpusSnapshot)
+        ratings_ledger (Any): Индекс уже выставленных оценок
+        surname (str): Значение фамилии (SURNAME)
+        username (str): Значение имени (USERNAME)
+        affiliation (str): Значение принадлежности (AFFILIATION)
+
+    Returns:
+        Dict[str, Any]: gr.update заголовка
+    """
+
+    remaining: Optional[int] = None
+
+    if config_data.Scheduler_MODE == "round_robin":
+        remaining = count_rows_to_evaluate(
+            corpus.csv_files,
+            corpus.dataframes,
+            ratings_ledger,
+            config_data.Settings_EVALUATE_LIMIT,
+            surname,
+            username,
+            affiliation,
+        )
+
+    return gr.update(value=get_step_2(remaining), visible=True)
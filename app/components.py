@@ -11,12 +11,16 @@ from typing import List, Literal, Optional
 # Importing necessary components for the Gradio app
 
 
+def html_message_value(message: str = "", error: bool = True) -> str:
+    css_class = "noti_err" if error else "noti_true"
+
+    return f"<h3 class='{css_class}'>{message}</h3>"
+
+
 def html_message(
     message: str = "", error: bool = True, visible: bool = True
 ) -> gr.HTML:
-    css_class = "noti_err" if error else "noti_true"
-
-    return gr.HTML(value=f"<h3 class='{css_class}'>{message}</h3>", visible=visible)
+    return gr.HTML(value=html_message_value(message, error), visible=visible)
 
 
 def dataframe(
@@ -30,10 +34,9 @@ def dataframe(
     interactive: bool = False,
     elem_classes: Optional[str] = "dataframe",
 ) -> gr.Dataframe:
-    if headers is None or values is None:
-        datatype = "str"
-    else:
-        datatype = ["markdown"] * len(headers)
+    # Число столбцов результатов А и Б меняется при случайном порядке результатов,
+    # поэтому тип задается сразу для всех столбцов
+    datatype = "str" if headers is None else "markdown"
 
     return gr.Dataframe(
         value=values,
@@ -0,0 +1,229 @@
+"""
+File: course_table.py
+Author: Dmitry Ryumin
+Description: Vectorised ingestion of course recommendations into a long-format table.
+License: MIT License
+"""
+
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+# Importing necessary components for the Gradio app
+from app.utils import SUBJECT_WRAPPER
+
+COURSE_TABLE_COLUMNS = [
+    "source_file",
+    "ID",
+    "system",
+    "rank",
+    "course",
+    "confidence",
+    "in_catalog",
+    "display_course",
+]
+
+# Позиции колонок с рекомендациями: А - "CS=ранг|дисциплина|уверенность;...", Б - "CS=дисциплина;..."
+SYSTEM_COLUMNS = {"A": (7, False), "B": (6, True)}
+
+CourseKey = Tuple[str, str, str]
+
+
+def explode_course_column(
+    ids: pd.Series, course_data: pd.Series, is_simple_format: bool
+) -> pd.DataFrame:
+    """
+    Разбор колонки с рекомендациями курсов сразу для всех строк DataFrame
+
+    Args:
+        ids (pd.Series): ID вакансий
+        course_data (pd.Series): Строки с курсами в формате parse_course_data
+        is_simple_format (bool): Если True, строка содержит только названия курсов, разделенные ";"
+
+    Returns:
+        pd.DataFrame: Таблица с колонками ID, rank, course, confidence
+    """
+
+    courses = (
+        course_data.fillna("")
+        .astype(str)
+        .str.replace("CS=", "", regex=False)
+        .str.split(";")
+        .explode()
+        .str.strip()
+    )
+    courses = courses[courses.notna() & (courses != "")]
+
+    if courses.empty:
+        return pd.DataFrame(columns=["ID", "rank", "course", "confidence"])
+
+    if is_simple_format:
+        # В упрощенном формате ранга нет - рангом считается позиция курса в строке
+        rank = (courses.groupby(level=0).cumcount() + 1).astype(str)
+        course, confidence = courses, pd.Series("", index=courses.index)
+    else:
+        # Поля курса: ранг, название и уверенность (как в parse_course_data)
+        fields = courses.str.split("|", expand=True).reindex(columns=[0, 1, 2])
+        rank = fields[0].fillna("").str.strip()
+        course = fields[1].fillna("").str.strip()
+        confidence = fields[2].fillna("").str.strip()
+
+    table = pd.DataFrame(
+        {
+            "ID": ids.astype(str).reindex(courses.index).to_numpy(),
+            "rank": rank.to_numpy(),
+            "course": course.to_numpy(),
+            "confidence": confidence.to_numpy(),
+        }
+    )
+
+    return table[table["course"] != ""]
+
+
+def get_record_column(records: Sequence[Any], field: str) -> List[Optional[str]]:
+    """
+    Получение значений одного поля всех записей вакансий файла. Записи из хранилища
+    отдают поле целиком, не декодируя остальные поля
+
+    Args:
+        records (Sequence[Any]): Записи вакансий (VacancyRecord) одного файла
+        field (str): Имя поля записи
+
+    Returns:
+        List[Optional[str]]: Значения поля в порядке строк файла
+    """
+
+    column = getattr(records, "column", None)
+
+    if column is not None:
+        return column(field)
+
+    return [getattr(record, field) for record in records]
+
+
+def build_course_table(
+    csv_files: List[Union[str, Path]],
+    vacancy_records: List[Sequence[Any]],
+    unique_subjects: set,
+) -> pd.DataFrame:
+    """
+    Построение длинной таблицы рекомендаций курсов по всем файлам с исходными данными за один проход
+
+    Args:
+        csv_files (List[Union[str, Path]]): Список путей к CSV файлам с исходными данными
+        vacancy_records (List[Sequence[Any]]): Записи вакансий (VacancyRecord) в порядке csv_files
+        unique_subjects (set): Множество уникальных названий дисциплин в нижнем регистре
+
+    Returns:
+        pd.DataFrame: Таблица с колонками COURSE_TABLE_COLUMNS
+    """
+
+    tables = []
+
+    for csv_file, records in zip(csv_files, vacancy_records):
+        ids = pd.Series(get_record_column(records, "id"), dtype=object)
+
+        for system, (_, is_simple_format) in SYSTEM_COLUMNS.items():
+            table = explode_course_column(
+                ids,
+                pd.Series(
+                    get_record_column(records, f"courses_{system.lower()}"),
+                    dtype=object,
+                ),
+                is_simple_format,
+            )
+            table.insert(0, "source_file", Path(csv_file).name)
+            table.insert(2, "system", system)
+            tables.append(table)
+
+    if not tables:
+        return pd.DataFrame(columns=COURSE_TABLE_COLUMNS)
+
+    return apply_subjects_catalog(pd.concat(tables, ignore_index=True), unique_subjects)
+
+
+def apply_subjects_catalog(
+    course_table: pd.DataFrame, unique_subjects: set
+) -> pd.DataFrame:
+    """
+    Пересчет признака наличия дисциплины в справочнике и отображаемого названия дисциплины
+
+    Args:
+        course_table (pd.DataFrame): Таблица с колонками source_file, ID, system, rank, course, confidence
+        unique_subjects (set): Множество уникальных названий дисциплин в нижнем регистре
+
+    Returns:
+        pd.DataFrame: Новая таблица с колонками COURSE_TABLE_COLUMNS
+    """
+
+    course_table = course_table.copy()
+
+    course_table["in_catalog"] = (
+        course_table["course"].str.lower().isin(unique_subjects).to_numpy()
+    )
+    wrapper_prefix, wrapper_suffix = SUBJECT_WRAPPER.split("{}")
+    course_table["display_course"] = np.where(
+        course_table["in_catalog"],
+        course_table["course"],
+        wrapper_prefix + course_table["course"] + wrapper_suffix,
+    )
+
+    return course_table[COURSE_TABLE_COLUMNS]
+
+
+def build_course_table_index(
+    course_table: pd.DataFrame,
+) -> Dict[CourseKey, np.ndarray]:
+    """
+    Построение индекса (имя файла, ID, система) -> номера строк длинной таблицы
+
+    Args:
+        course_table (pd.DataFrame): Таблица, построенная build_course_table
+
+    Returns:
+        Dict[CourseKey, np.ndarray]: Индекс строк
+    """
+
+    if course_table.empty:
+        return {}
+
+    return course_table.groupby(["source_file", "ID", "system"], sort=False).indices
+
+
+def get_vacancy_courses(
+    course_table: pd.DataFrame,
+    course_table_index: Dict[CourseKey, np.ndarray],
+    source_file: Union[str, Path],
+    vacancy_id: Union[str, int],
+) -> Tuple[List[List[str]], List[List[str]]]:
+    """
+    Получение рекомендаций курсов для одной вакансии в формате для отображения
+
+    Args:
+        course_table (pd.DataFrame): Таблица, построенная build_course_table
+        course_table_index (Dict[CourseKey, np.ndarray]): Индекс, построенный build_course_table_index
+        source_file (Union[str, Path]): Путь к CSV файлу с исходными данными
+        vacancy_id (Union[str, int]): ID вакансии
+
+    Returns:
+        Tuple[List[List[str]], List[List[str]]]:
+            - List[List[str]]: Курсы системы А в виде [дисциплина, уверенность]
+            - List[List[str]]: Курсы системы Б в виде [дисциплина]
+    """
+
+    key = (Path(source_file).name, str(vacancy_id))
+    empty = np.empty(0, dtype=np.intp)
+
+    rows_a = course_table.iloc[course_table_index.get(key + ("A",), empty)]
+    rows_b = course_table.iloc[course_table_index.get(key + ("B",), empty)]
+
+    dataframe_a = [
+        [course, confidence] if confidence else [course]
+        for course, confidence in zip(
+            rows_a["display_course"].tolist(), rows_a["confidence"].tolist()
+        )
+    ]
+    dataframe_b = [[course] for course in rows_b["display_course"].tolist()]
+
+    return dataframe_a, dataframe_b
@@ -0,0 +1,315 @@
+"""
+File: coverage_scheduler.py
+Author: Dmitry Ryumin
+Description: Assignment of the least covered or most uncertain vacancies to raters.
+License: MIT License
+"""
+
+import math
+import time
+import heapq
+import threading
+from typing import AbstractSet, Any, Dict, List, Mapping, Optional, Tuple
+
+# Importing necessary components for the Gradio app
+from app.item_statistics import ItemStatisticsIndex
+from app.ratings_ledger import RatedKey, UserKey
+
+# Элемент кучи: (приоритет, порядок вакансии, ключ вакансии)
+HeapEntry = Tuple[Any, Tuple[int, int], RatedKey]
+
+
+class CoverageScheduler:
+    """
+    Выбор для участника вакансии с наименьшим числом оценок среди еще не оцененных им.
+
+    Приоритет вакансии - число ее оценок плюс число участников, которым она сейчас показана.
+    Приоритеты хранятся в куче с ленивым удалением: при изменении приоритета в кучу добавляется
+    новый элемент, а устаревшие элементы отбрасываются при извлечении. Вакансии, набравшие
+    target_ratings оценок, больше не назначаются. Если assigning равен False, планировщик
+    только ведет учет покрытия: куча не строится, а assign и peek возвращают None
+    """
+
+    def __init__(
+        self,
+        target_ratings: int = 0,
+        reservation_ttl: float = 600.0,
+        assigning: bool = True,
+    ) -> None:
+        self.target_ratings = target_ratings
+        self.reservation_ttl = reservation_ttl
+        self.assigning = assigning
+
+        self._lock = threading.Lock()
+        self._heap: List[HeapEntry] = []
+        self._order: Dict[RatedKey, Tuple[int, int]] = {}
+        self._counts: Dict[RatedKey, int] = {}
+        self._reserved: Dict[RatedKey, int] = {}
+        self._reservations: Dict[UserKey, Tuple[RatedKey, float]] = {}
+
+    def rebuild(
+        self, order: Mapping[RatedKey, Tuple[int, int]], counts: Mapping[RatedKey, int]
+    ) -> None:
+        """
+        Построение кучи заново
+
+        Args:
+            order (Mapping[RatedKey, Tuple[int, int]]): Вакансии и их порядок при равном числе
+                оценок (позиция в файле, номер файла)
+            counts (Mapping[RatedKey, int]): Число оценок каждой вакансии
+        """
+
+        with self._lock:
+            self._order = dict(order)
+            self._counts = {key: counts.get(key, 0) for key in self._order}
+            self._reservations = {
+                user_key: reservation
+                for user_key, reservation in self._reservations.items()
+                if reservation[0] in self._order
+            }
+            self._reserved = {}
+            for key, _ in self._reservations.values():
+                self._reserved[key] = self._reserved.get(key, 0) + 1
+
+            self._heap = (
+                [
+                    (self._priority(key), position, key)
+                    for key, position in self._order.items()
+                    if not self._is_covered(key)
+                ]
+                if self.assigning
+                else []
+            )
+            heapq.heapify(self._heap)
+
+    def _priority(self, key: RatedKey) -> Any:
+        return self._counts.get(key, 0) + self._reserved.get(key, 0)
+
+    def _is_covered(self, key: RatedKey) -> bool:
+        return bool(self.target_ratings) and self._counts[key] >= self.target_ratings
+
+    def _push(self, key: RatedKey) -> None:
+        if self.assigning and key in self._order and not self._is_covered(key):
+            heapq.heappush(self._heap, (self._priority(key), self._order[key], key))
+
+    def _release(self, user_key: UserKey) -> None:
+        reservation = self._reservations.pop(user_key, None)
+
+        if reservation is None:
+            return
+
+        key = reservation[0]
+        self._reserved[key] -= 1
+
+        if not self._reserved[key]:
+            del self._reserved[key]
+
+        self._push(key)
+
+    def _expire(self, now: float) -> None:
+        expired = [
+            user_key
+            for user_key, (_, expires_at) in self._reservations.items()
+            if expires_at <= now
+        ]
+
+        for user_key in expired:
+            self._release(user_key)
+
+    def _select(self, rated: AbstractSet[RatedKey]) -> Optional[RatedKey]:
+        skipped = []
+        selected = None
+
+        while self._heap:
+            priority, position, key = self._heap[0]
+
+            # Устаревший элемент или вакансия, уже набравшая нужное число оценок
+            if (
+                key not in self._order
+                or self._is_covered(key)
+                or priority != self._priority(key)
+            ):
+                heapq.heappop(self._heap)
+                continue
+
+            if key in rated:
+                skipped.append(heapq.heappop(self._heap))
+                continue
+
+            selected = key
+            break
+
+        for entry in skipped:
+            heapq.heappush(self._heap, entry)
+
+        return selected
+
+    def assign(
+        self, user_key: UserKey, rated: AbstractSet[RatedKey]
+    ) -> Optional[RatedKey]:
+        """
+        Назначение участнику вакансии с наименьшим приоритетом, которую он еще не оценивал
+
+        Args:
+            user_key (UserKey): Ключ участника
+            rated (AbstractSet[RatedKey]): Вакансии, уже оцененные участником
+
+        Returns:
+            Optional[RatedKey]: Ключ вакансии или None, если назначать больше нечего
+        """
+
+        with self._lock:
+            self._expire(time.monotonic())
+            self._release(user_key)
+
+            assigned = self._select(rated)
+
+            if assigned is not None:
+                self._reservations[user_key] = (
+                    assigned,
+                    time.monotonic() + self.reservation_ttl,
+                )
+                self._reserved[assigned] = self._reserved.get(assigned, 0) + 1
+                self._push(assigned)
+
+            return assigned
+
+    def peek(
+        self, user_key: UserKey, rated: AbstractSet[RatedKey]
+    ) -> Optional[RatedKey]:
+        """
+        Предсказание вакансии, которая будет назначена участнику после оценки текущей,
+        без резервирования. Текущая вакансия участника не предсказывается
+
+        Args:
+            user_key (UserKey): Ключ участника
+            rated (AbstractSet[RatedKey]): Вакансии, уже оцененные участником
+
+        Returns:
+            Optional[RatedKey]: Ключ вакансии или None, если назначать больше нечего
+        """
+
+        with self._lock:
+            reservation = self._reservations.get(user_key)
+
+            if reservation is not None:
+                rated = rated | {reservation[0]}
+
+            return self._select(rated)
+
+    def record(self, key: RatedKey, user_key: Optional[UserKey] = None) -> None:
+        """
+        Учет новой оценки вакансии
+
+        Args:
+            key (RatedKey): Ключ оцененной вакансии
+            user_key (Optional[UserKey]): Ключ участника, который выставил оценку
+        """
+
+        with self._lock:
+            if key not in self._order:
+                return
+
+            self._counts[key] += 1
+
+            reservation = self._reservations.get(user_key)
+            if reservation is not None and reservation[0] == key:
+                self._release(user_key)
+            else:
+                self._push(key)
+
+    def coverage(self) -> Dict[str, int]:
+        """
+        Получение сводки покрытия вакансий оценками
+
+        Returns:
+            Dict[str, int]: Число вакансий, вакансий без оценок, покрытых вакансий и оценок
+        """
+
+        with self._lock:
+            counts = list(self._counts.values())
+
+            return {
+                "items": len(counts),
+                "unrated": sum(count == 0 for count in counts),
+                "covered": sum(self._is_covered(key) for key in self._counts),
+                "ratings": sum(counts),
+            }
+
+
+class UncertaintyScheduler(CoverageScheduler):
+    """
+    Выбор вакансии, для которой сравнение систем А и Б пока наименее определено.
+
+    Сначала назначаются вакансии, у которых меньше двух оценок (по числу оценок), затем -
+    вакансии с наибольшей ожидаемой стандартной ошибкой разности А - Б с учетом оценок,
+    которые сейчас выставляются. Вакансии со стандартной ошибкой не выше target_stderr
+    больше не назначаются
+    """
+
+    def __init__(
+        self,
+        item_statistics: ItemStatisticsIndex,
+        target_ratings: int = 0,
+        target_stderr: float = 0.0,
+        reservation_ttl: float = 600.0,
+    ) -> None:
+        super().__init__(target_ratings, reservation_ttl)
+
+        self.item_statistics = item_statistics
+        self.target_stderr = target_stderr
+
+    def _priority(self, key: RatedKey) -> Any:
+        diff = self.item_statistics.get_diff(key)
+        pending = self._reserved.get(key, 0)
+
+        if diff.n < 2:
+            return (0, diff.n + pending)
+
+        return (1, -math.sqrt(diff.variance / (diff.n + pending)))
+
+    def _is_covered(self, key: RatedKey) -> bool:
+        if super()._is_covered(key):
+            return True
+
+        if not self.target_stderr:
+            return False
+
+        diff = self.item_statistics.get_diff(key)
+
+        return diff.n > 1 and diff.stderr <= self.target_stderr
+
+
+def create_scheduler(
+    config: Any, item_statistics: ItemStatisticsIndex
+) -> CoverageScheduler:
+    """
+    Создание планировщика согласно настройке Scheduler.MODE. В режиме round_robin
+    планировщик только ведет учет покрытия вакансий оценками
+
+    Args:
+        config (Any): Объект конфигурации
+        item_statistics (ItemStatisticsIndex): Статистика оценок вакансий
+
+    Returns:
+        CoverageScheduler: Планировщик
+    """
+
+    mode = config.Scheduler_MODE
+
+    if mode in ("round_robin", "coverage"):
+        return CoverageScheduler(
+            config.Scheduler_TARGET_RATINGS,
+            config.Scheduler_RESERVATION_TTL,
+            assigning=mode == "coverage",
+        )
+
+    if mode == "uncertainty":
+        return UncertaintyScheduler(
+            item_statistics,
+            config.Scheduler_TARGET_RATINGS,
+            config.Scheduler_TARGET_STDERR,
+            config.Scheduler_RESERVATION_TTL,
+        )
+
+    raise ValueError(f"Неизвестный режим назначения вакансий: {mode}")
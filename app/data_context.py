@@ -0,0 +1,790 @@
+"""
+File: data_context.py
+Author: Dmitry Ryumin
+Description: Data context lifecycle - background loading of the corpus, catalog and ratings.
+License: MIT License
+"""
+
+import time
+import atexit
+import threading
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+# Importing necessary components for the Gradio app
+from app.course_table import (
+    CourseKey,
+    apply_subjects_catalog,
+    build_course_table,
+    build_course_table_index,
+    get_record_column,
+    get_vacancy_courses,
+)
+from app.coverage_scheduler import create_scheduler
+from app.data_watcher import DataWatcher
+from app.item_statistics import ItemStatisticsIndex
+from app.metrics import stage_timer
+from app.rating_utils import build_row_index, pop_next_from_queue
+from app.ratings_ledger import (
+    RatedKey,
+    RatingsLedger,
+    make_rated_key,
+    make_user_key,
+)
+from app.ratings_store import RatingsStore, create_ratings_store
+from app.render_cache import (
+    RenderCache,
+    get_subjects_catalog_version,
+    prepare_vacancy_payload,
+)
+from app.subjects_cache import load_unique_subjects
+from app.utils import get_csv_files
+from app.vacancy_records import VacancyRecord, build_vacancy_records
+from app.vacancy_store import load_vacancy_store, open_vacancy_store
+from app.vsa_cache import load_vsa_dataframes
+
+
+@dataclass(frozen=True)
+class CorpusSnapshot:
+    """
+    Согласованный набор данных о вакансиях и справочнике дисциплин. Записи вакансий хранятся
+    по файлам в порядке строк DataFrame, позиция записи берется из row_index. Если включено
+    хранилище VacancyStore, записи отображаются в память, а в DataFrame остаются только ID
+    """
+
+    csv_files: List[Path]
+    dataframes: List[pd.DataFrame]
+    records: List[Sequence[VacancyRecord]]
+    row_index: Dict[RatedKey, Tuple[int, int]]
+    unique_subjects: frozenset
+    catalog_version: str
+    course_table: pd.DataFrame
+    course_table_index: Dict[CourseKey, Any]
+    generation: int = 0
+
+
+class DataContext:
+    """
+    Загрузка данных приложения в фоновом потоке по этапам с замером времени каждого этапа.
+    Обработчики ожидают готовности через wait_ready или сообщают о ней пользователю
+    """
+
+    def __init__(self, config: Any) -> None:
+        self.config = config
+
+        self.ready = threading.Event()
+        self.stage = "pending"
+        self.timings: Dict[str, float] = {}
+        self.error: Optional[BaseException] = None
+
+        self.corpus: Optional[CorpusSnapshot] = None
+        self.ratings_store: Optional[RatingsStore] = None
+        self.ratings_ledger = RatingsLedger()
+        self.item_statistics = ItemStatisticsIndex()
+        self.scheduler = create_scheduler(config, self.item_statistics)
+        self.render_cache = RenderCache(config.RenderCache_MAX_SIZE)
+        self.prefetcher: Optional[ThreadPoolExecutor] = None
+
+        if config.Prefetch_ENABLED and config.RenderCache_MAX_SIZE:
+            self.prefetcher = ThreadPoolExecutor(
+                max_workers=config.Prefetch_WORKERS, thread_name_prefix="prefetch"
+            )
+
+        self.watcher: Optional[DataWatcher] = None
+
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        # Учет оценок и повторное чтение всех оценок выполняются по одному. Оценки, которые
+        # записываются в хранилище, учитываются в _submitting, чтобы не записать их дважды
+        self._ratings_lock = threading.RLock()
+        self._submitting: Set[Tuple[Any, RatedKey]] = set()
+        self._ratings_position = 0
+
+    @contextmanager
+    def _stage(self, name: str) -> Iterator[None]:
+        self.stage = name
+        start_time = time.perf_counter()
+
+        with stage_timer(f"load_{name}"):
+            yield
+
+        self.timings[name] = time.perf_counter() - start_time
+
+    def start(self) -> None:
+        """
+        Запуск загрузки данных в фоновом потоке, если она еще не запущена и данные
+        не загружены до fork
+        """
+
+        with self._start_lock:
+            if self._thread is not None or self.ready.is_set():
+                return
+
+            self._thread = threading.Thread(
+                target=self.load, name="data-context", daemon=True
+            )
+            self._thread.start()
+
+    def load(self, start_watcher: bool = True) -> None:
+        """
+        Загрузка всех данных приложения
+
+        Args:
+            start_watcher (bool): Запустить наблюдение за файлами после загрузки. В режиме
+                нескольких процессов наблюдение запускается в каждом процессе после fork
+        """
+
+        config = self.config
+        start_time = time.perf_counter()
+
+        try:
+            if config.Watcher_ENABLED:
+                self.watcher = DataWatcher(
+                    self, config.Watcher_INTERVAL, config.Watcher_BACKEND
+                )
+                self.watcher.prime()
+
+            with self._stage("vsa_files"):
+                csv_files = get_csv_files(config.StaticPaths_VSA)
+
+            with self._stage("vsa_dataframes"):
+                records = self._load_records(csv_files)
+                dataframes = self._id_frames(records)
+                row_index = build_row_index(csv_files, dataframes)
+
+            with self._stage("ratings"):
+                self.ratings_store = create_ratings_store(config)
+                atexit.register(self.ratings_store.close)
+                self._load_ratings(self.ratings_ledger, self.item_statistics)
+
+            with self._stage("subjects"):
+                unique_subjects = frozenset(
+                    load_unique_subjects(
+                        config.StaticPaths_SUBJECTS,
+                        config.DataframeHeaders_RU_SUBJECT,
+                        config.StaticPaths_SUBJECTS_CACHE,
+                        max_workers=config.Settings_EXCEL_WORKERS,
+                    )
+                )
+
+            with self._stage("course_table"):
+                course_table = build_course_table(csv_files, records, unique_subjects)
+                course_table_index = build_course_table_index(course_table)
+
+            with self._stage("scheduler"):
+                self._rebuild_scheduler(row_index)
+
+            self.corpus = CorpusSnapshot(
+                csv_files=csv_files,
+                dataframes=dataframes,
+                records=records,
+                row_index=row_index,
+                unique_subjects=unique_subjects,
+                catalog_version=get_subjects_catalog_version(unique_subjects),
+                course_table=course_table,
+                course_table_index=course_table_index,
+            )
+
+            if self.watcher is not None and start_watcher:
+                self.watcher.start()
+                atexit.register(self.watcher.stop)
+
+            self.stage = "ready"
+        except Exception as e:
+            self.error = e
+            self.stage = "failed"
+            raise
+        finally:
+            self.timings["total"] = time.perf_counter() - start_time
+            self.ready.set()
+
+    def before_fork(self) -> None:
+        """
+        Подготовка загруженных данных к fork: закрываются хранилище оценок (поток записи,
+        соединения SQLite) и пул упреждающей подготовки, чтобы в процесс не копировались
+        потоки и открытые соединения
+        """
+
+        if self.ratings_store is not None:
+            self.ratings_store.close()
+
+        if self.prefetcher is not None:
+            self.prefetcher.shutdown(wait=True)
+
+    def after_fork(self) -> None:
+        """
+        Запуск в процессе после fork собственных хранилища оценок, пула упреждающей подготовки
+        и наблюдения за файлами. Оценки, записанные другими процессами, попадают в индекс оценок
+        через наблюдение за CSV файлами StaticPaths.ARENA или через sync_ratings (SQLite).
+        Перезапущенный процесс сразу дочитывает оценки, записанные после загрузки данных
+        """
+
+        config = self.config
+
+        self.ratings_store = create_ratings_store(config)
+        self.sync_ratings()
+
+        if self.prefetcher is not None:
+            self.prefetcher = ThreadPoolExecutor(
+                max_workers=config.Prefetch_WORKERS, thread_name_prefix="prefetch"
+            )
+
+        if self.watcher is not None:
+            self.watcher.start()
+
+    def close(self) -> None:
+        """
+        Остановка наблюдения за файлами и запись оставшихся оценок
+        """
+
+        if self.watcher is not None:
+            self.watcher.stop()
+
+        if self.ratings_store is not None:
+            self.ratings_store.close()
+
+    def reload_vsa(self, changed_files: Iterable[Union[str, Path]]) -> None:
+        """
+        Обновление данных о вакансиях: заново читаются только новые и измененные файлы,
+        после чего обработчики атомарно переключаются на новый набор данных
+
+        Args:
+            changed_files (Iterable[Union[str, Path]]): Новые, измененные и удаленные CSV файлы
+        """
+
+        with self._reload_lock:
+            corpus = self.corpus
+            changed_names = {Path(file).name for file in changed_files}
+
+            csv_files = get_csv_files(self.config.StaticPaths_VSA)
+            records = self._load_records(
+                csv_files,
+                loaded={
+                    str(file): file_records
+                    for file, file_records in zip(corpus.csv_files, corpus.records)
+                    if file.name not in changed_names
+                },
+            )
+            dataframes = self._id_frames(records)
+
+            updated = [
+                (file, file_records)
+                for file, file_records in zip(csv_files, records)
+                if file.name in changed_names
+            ]
+            course_tables = [
+                table
+                for table in (
+                    corpus.course_table[
+                        ~corpus.course_table["source_file"].isin(changed_names)
+                    ],
+                    build_course_table(
+                        [file for file, _ in updated],
+                        [file_records for _, file_records in updated],
+                        corpus.unique_subjects,
+                    ),
+                )
+                if not table.empty
+            ]
+            course_table = (
+                pd.concat(course_tables, ignore_index=True)
+                if course_tables
+                else corpus.course_table.iloc[0:0]
+            )
+
+            self.corpus = replace(
+                corpus,
+                csv_files=csv_files,
+                dataframes=dataframes,
+                records=records,
+                row_index=build_row_index(csv_files, dataframes),
+                course_table=course_table,
+                course_table_index=build_course_table_index(course_table),
+                generation=corpus.generation + 1,
+            )
+            self._rebuild_scheduler(self.corpus.row_index)
+
+        print(
+            f"Обновлены файлы с исходными данными: {', '.join(sorted(changed_names))}"
+        )
+
+    def _load_records(
+        self,
+        csv_files: List[Path],
+        loaded: Optional[Dict[str, Sequence[VacancyRecord]]] = None,
+    ) -> List[Sequence[VacancyRecord]]:
+        config = self.config
+        row_limit = self.get_row_limit()
+        records = dict(loaded or {})
+
+        # Файлы с действующим хранилищем не читаются: ID, тексты и курсы вакансий
+        # берутся из хранилища
+        if config.VacancyStore_ENABLED:
+            for csv_file in csv_files:
+                if str(csv_file) not in records:
+                    store = load_vacancy_store(
+                        csv_file, config.StaticPaths_VSA_STORE, row_limit
+                    )
+
+                    if store is not None:
+                        records[str(csv_file)] = store
+
+        missing = [csv_file for csv_file in csv_files if str(csv_file) not in records]
+
+        if missing:
+            dataframes = load_vsa_dataframes(
+                missing,
+                config.StaticPaths_VSA_CACHE,
+                nrows=row_limit,
+                retain=[csv_file for csv_file in csv_files if csv_file not in missing],
+            )
+
+            for csv_file, df in zip(missing, dataframes):
+                records[str(csv_file)] = self._build_records(csv_file, df, row_limit)
+
+        return [records[str(csv_file)] for csv_file in csv_files]
+
+    def _build_records(
+        self, csv_file: Path, df: pd.DataFrame, row_limit: Optional[int]
+    ) -> Sequence[VacancyRecord]:
+        if self.config.VacancyStore_ENABLED:
+            return open_vacancy_store(
+                csv_file, df, self.config.StaticPaths_VSA_STORE, row_limit
+            )
+
+        return build_vacancy_records(csv_file, df)
+
+    @staticmethod
+    def _id_frames(records: List[Sequence[VacancyRecord]]) -> List[pd.DataFrame]:
+        # Тексты вакансий читаются из записей, поэтому в памяти процесса остаются только ID
+        return [
+            pd.DataFrame({"ID": get_record_column(file_records, "id")})
+            for file_records in records
+        ]
+
+    def get_row_limit(self) -> Optional[int]:
+        """
+        Получение количества первых строк, которые читаются из файлов с исходными данными
+
+        Returns:
+            Optional[int]: Settings.EVALUATE_LIMIT или None, если файлы читаются целиком
+        """
+
+        if not self.config.Settings_STREAM_VSA:
+            return None
+
+        return self.config.Settings_EVALUATE_LIMIT
+
+    def reload_subjects(self, changed: Optional[Set[str]] = None) -> None:
+        """
+        Обновление справочника дисциплин с пересчетом отображаемых названий дисциплин
+
+        Args:
+            changed (Optional[Set[str]]): Новые и измененные Excel файлы. Остальные файлы
+                повторно не разбираются. По умолчанию проверяются все файлы
+        """
+
+        with self._reload_lock:
+            corpus = self.corpus
+            unique_subjects = frozenset(
+                load_unique_subjects(
+                    self.config.StaticPaths_SUBJECTS,
+                    self.config.DataframeHeaders_RU_SUBJECT,
+                    self.config.StaticPaths_SUBJECTS_CACHE,
+                    max_workers=self.config.Settings_EXCEL_WORKERS,
+                    changed=changed,
+                )
+            )
+
+            if unique_subjects == corpus.unique_subjects:
+                return
+
+            # Порядок строк не меняется, поэтому индекс длинной таблицы остается прежним
+            self.corpus = replace(
+                corpus,
+                unique_subjects=unique_subjects,
+                catalog_version=get_subjects_catalog_version(unique_subjects),
+                course_table=apply_subjects_catalog(
+                    corpus.course_table, unique_subjects
+                ),
+            )
+
+        print(f"Обновлен справочник дисциплин: {len(unique_subjects)} дисциплин")
+
+    def _load_ratings(
+        self, ratings_ledger: RatingsLedger, item_statistics: ItemStatisticsIndex
+    ) -> None:
+        # Позиция запоминается до чтения: оценки, записанные во время чтения, sync_ratings
+        # прочитает повторно, а индекс оценок не учтет их дважды
+        self._ratings_position = self.ratings_store.get_position()
+
+        with stage_timer("ratings_scan"):
+            for source_file, row in self.ratings_store.iter_ratings():
+                if ratings_ledger.add(
+                    row.get("SURNAME"),
+                    row.get("USERNAME"),
+                    row.get("AFFILIATION"),
+                    source_file,
+                    row.get("ID"),
+                ):
+                    item_statistics.add(
+                        make_rated_key(source_file, row.get("ID")),
+                        row.get("SBERT"),
+                        row.get("SBERT_LLM"),
+                    )
+
+    def _rebuild_scheduler(self, row_index: Dict[RatedKey, Tuple[int, int]]) -> None:
+        # При равном числе оценок вакансии чередуются между файлами, как в get_evaluation_queue
+        limit_per_file = self.config.Settings_EVALUATE_LIMIT
+
+        self.scheduler.rebuild(
+            {
+                rated_key: (position, i)
+                for rated_key, (i, position) in row_index.items()
+                if position < limit_per_file
+            },
+            self.ratings_ledger.count_by_item(),
+        )
+
+    def record_rating(
+        self,
+        surname: str,
+        username: str,
+        affiliation: str,
+        source_file: Union[str, Path],
+        vacancy_id: Union[str, int],
+        rating_a: Any = None,
+        rating_b: Any = None,
+    ) -> bool:
+        """
+        Учет новой оценки в индексе оценок, в статистике вакансии и в планировщике.
+        Повторная оценка той же вакансии тем же пользователем не учитывается
+
+        Args:
+            surname (str): Значение фамилии (SURNAME)
+            username (str): Значение имени (USERNAME)
+            affiliation (str): Значение принадлежности (AFFILIATION)
+            source_file (Union[str, Path]): Путь к CSV файлу с исходными данными
+            vacancy_id (Union[str, int]): ID оцененной вакансии
+            rating_a (Any): Оценка системы А (SBERT)
+            rating_b (Any): Оценка системы Б (SBERT_LLM)
+
+        Returns:
+            bool: True, если пользователь ранее не оценивал эту вакансию
+        """
+
+        with self._ratings_lock:
+            if not self.ratings_ledger.add(
+                surname, username, affiliation, source_file, vacancy_id
+            ):
+                return False
+
+            rated_key = make_rated_key(source_file, vacancy_id)
+
+            # Статистика обновляется до планировщика, чтобы он учел новый приоритет вакансии
+            self.item_statistics.add(rated_key, rating_a, rating_b)
+            self.scheduler.record(
+                rated_key, make_user_key(surname, username, affiliation)
+            )
+
+        return True
+
+    def submit_rating(
+        self,
+        surname: str,
+        username: str,
+        affiliation: str,
+        source_file: Union[str, Path],
+        vacancy_id: Union[str, int],
+        rating_a: Any,
+        rating_b: Any,
+    ) -> bool:
+        """
+        Учет новой оценки и ее запись в хранилище оценок
+
+        Args:
+            surname (str): Значение фамилии (SURNAME)
+            username (str): Значение имени (USERNAME)
+            affiliation (str): Значение принадлежности (AFFILIATION)
+            source_file (Union[str, Path]): Путь к CSV файлу с исходными данными
+            vacancy_id (Union[str, int]): ID оцененной вакансии
+            rating_a (Any): Оценка системы А (SBERT)
+            rating_b (Any): Оценка системы Б (SBERT_LLM)
+
+        Returns:
+            bool: True, если оценка новая и записана
+
+        Raises:
+            RatingsStoreError: Оценка не записана в хранилище оценок
+        """
+
+        submission = (
+            make_user_key(surname, username, affiliation),
+            make_rated_key(source_file, vacancy_id),
+        )
+
+        with self._ratings_lock:
+            if submission in self._submitting or self.ratings_ledger.is_rated(
+                surname, username, affiliation, source_file, vacancy_id
+            ):
+                return False
+
+            self._submitting.add(submission)
+
+        # Индексы обновляются только после записи оценки на диск: оценка, которую не удалось
+        # записать, не учитывается в покрытии и снова предлагается пользователю
+        try:
+            with stage_timer("ratings_append"):
+                self.ratings_store.append(
+                    Path(source_file).name,
+                    {
+                        "ID": vacancy_id,
+                        "SURNAME": surname,
+                        "USERNAME": username,
+                        "AFFILIATION": affiliation,
+                        "SBERT": rating_a,
+                        "SBERT_LLM": rating_b,
+                    },
+                )
+
+            with self._ratings_lock:
+                self.record_rating(
+                    surname,
+                    username,
+                    affiliation,
+                    source_file,
+                    vacancy_id,
+                    rating_a,
+                    rating_b,
+                )
+        finally:
+            with self._ratings_lock:
+                self._submitting.discard(submission)
+
+        return True
+
+    def add_ratings(self, source_file: str, rows: List[Dict[str, Any]]) -> int:
+        """
+        Добавление в индекс оценок, записанных другим процессом
+
+        Args:
+            source_file (str): Имя CSV файла с оценками
+            rows (List[Dict[str, Any]]): Новые строки с оценками
+
+        Returns:
+            int: Количество новых оценок
+        """
+
+        return sum(
+            self.record_rating(
+                row.get("SURNAME"),
+                row.get("USERNAME"),
+                row.get("AFFILIATION"),
+                source_file,
+                row.get("ID"),
+                row.get("SBERT"),
+                row.get("SBERT_LLM"),
+            )
+            for row in rows
+        )
+
+    def sync_ratings(self) -> int:
+        """
+        Добавление в индекс оценок, записанных в хранилище оценок SQLite другими процессами
+
+        Returns:
+            int: Количество новых оценок
+        """
+
+        with self._ratings_lock:
+            rows, self._ratings_position = self.ratings_store.read_since(
+                self._ratings_position
+            )
+
+            return sum(
+                self.add_ratings(source_file, [row]) for source_file, row in rows
+            )
+
+    def assign_next_key(
+        self, surname: str, username: str, affiliation: str, corpus: CorpusSnapshot
+    ) -> Optional[List[str]]:
+        """
+        Назначение пользователю вакансии планировщиком (Scheduler.MODE = "coverage" или "uncertainty")
+
+        Args:
+            surname (str): Значение фамилии (SURNAME)
+            username (str): Значение имени (USERNAME)
+            affiliation (str): Значение принадлежности (AFFILIATION)
+            corpus (CorpusSnapshot): Набор данных
+
+        Returns:
+            Optional[List[str]]: [путь к файлу, ID] или None, если назначать больше нечего
+        """
+
+        rated_key = self.scheduler.assign(
+            make_user_key(surname, username, affiliation),
+            self.ratings_ledger.get_rated(surname, username, affiliation),
+        )
+
+        if rated_key is None or rated_key not in corpus.row_index:
+            return None
+
+        i, _ = corpus.row_index[rated_key]
+
+        return [str(corpus.csv_files[i]), rated_key[1]]
+
+    def prefetch_next(
+        self,
+        surname: str,
+        username: str,
+        affiliation: str,
+        evaluation_queue: List[List[str]],
+        corpus: CorpusSnapshot,
+    ) -> None:
+        """
+        Упреждающая подготовка данных вакансии, которая, вероятно, будет показана пользователю
+        после оценки текущей. Данные готовятся в фоновом потоке и попадают в кэш; если
+        предсказание не оправдалось, обработчик подготовит данные сам
+
+        Args:
+            surname (str): Значение фамилии (SURNAME)
+            username (str): Значение имени (USERNAME)
+            affiliation (str): Значение принадлежности (AFFILIATION)
+            evaluation_queue (List[List[str]]): Оставшаяся очередь вакансий пользователя
+            corpus (CorpusSnapshot): Набор данных
+        """
+
+        if self.prefetcher is None:
+            return
+
+        if self.config.Scheduler_MODE != "round_robin":
+            rated_key = self.scheduler.peek(
+                make_user_key(surname, username, affiliation),
+                self.ratings_ledger.get_rated(surname, username, affiliation),
+            )
+            next_key = None if rated_key is None else list(rated_key)
+        else:
+            next_key, _ = pop_next_from_queue(
+                evaluation_queue,
+                corpus.row_index,
+                self.ratings_ledger,
+                surname,
+                username,
+                affiliation,
+            )
+
+        if next_key is not None:
+            self.prefetcher.submit(self._prefetch_payload, *next_key, corpus)
+
+    def _prefetch_payload(
+        self, source_file: str, vacancy_id: str, corpus: CorpusSnapshot
+    ) -> None:
+        try:
+            with stage_timer("prefetch"):
+                self.get_vacancy_payload(source_file, vacancy_id, corpus)
+        except Exception as e:
+            print(f"Ошибка упреждающей подготовки вакансии {vacancy_id}: {e}")
+
+    def reload_ratings(self) -> None:
+        """
+        Построение индекса оценок заново, например после удаления CSV файла с оценками
+        """
+
+        ratings_ledger = RatingsLedger()
+        item_statistics = ItemStatisticsIndex()
+
+        with self._ratings_lock:
+            # Оценки, ожидающие записи, должны попасть в новый индекс
+            self.ratings_store.flush()
+            self._load_ratings(ratings_ledger, item_statistics)
+
+            self.ratings_ledger = ratings_ledger
+            self.item_statistics.replace(item_statistics)
+
+            self._rebuild_scheduler(self.corpus.row_index)
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Ожидание окончания загрузки данных
+
+        Args:
+            timeout (Optional[float]): Максимальное время ожидания в секундах
+
+        Returns:
+            bool: True, если данные успешно загружены
+        """
+
+        return self.ready.wait(timeout) and self.error is None
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Получение состояния загрузки данных
+
+        Returns:
+            Dict[str, Any]: Текущий этап, признак готовности и время выполнения этапов
+        """
+
+        return {
+            "stage": self.stage,
+            "ready": self.ready.is_set() and self.error is None,
+            "timings": dict(self.timings),
+        }
+
+    def get_vacancy_payload(
+        self,
+        source_file: str,
+        vacancy_id: Union[str, int],
+        corpus: Optional[CorpusSnapshot] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Получение подготовленных для отображения данных вакансии из кэша
+
+        Args:
+            source_file (str): Путь к CSV файлу с исходными данными
+            vacancy_id (Union[str, int]): ID вакансии
+            corpus (Optional[CorpusSnapshot]): Набор данных. По умолчанию - текущий
+
+        Returns:
+            Optional[Dict[str, Any]]: Данные вакансии или None, если вакансия не найдена
+        """
+
+        corpus = corpus or self.corpus
+        rated_key = make_rated_key(source_file, vacancy_id)
+
+        if rated_key not in corpus.row_index:
+            return None
+
+        def factory() -> Dict[str, Any]:
+            with stage_timer("render"):
+                i, position = corpus.row_index[rated_key]
+
+                dataframe_a, dataframe_b = get_vacancy_courses(
+                    corpus.course_table,
+                    corpus.course_table_index,
+                    source_file,
+                    vacancy_id,
+                )
+
+                return prepare_vacancy_payload(
+                    corpus.records[i][position], dataframe_a, dataframe_b
+                )
+
+        return self.render_cache.get_or_create(
+            rated_key + (corpus.catalog_version, corpus.generation), factory
+        )
@@ -0,0 +1,323 @@
+"""
+File: data_watcher.py
+Author: Dmitry Ryumin
+Description: Watching the data directories and incremental reload of the application data.
+License: MIT License
+"""
+
+import os
+import csv
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # Без watchdog изменения обнаруживаются только опросом директорий
+    FileSystemEventHandler = object
+    Observer = None
+
+# Importing necessary components for the Gradio app
+from app.utils import directory_listing_cache
+from app.vsa_cache import get_file_signature
+
+Signatures = Dict[str, Dict[str, int]]
+
+
+def scan_directory(directory: Union[str, Path], ext: str) -> Signatures:
+    """
+    Получение сигнатур всех файлов директории
+
+    Args:
+        directory (Union[str, Path]): Путь к директории
+        ext (str): Расширение файлов для поиска
+
+    Returns:
+        Signatures: Путь к файлу -> сигнатура (размер и время изменения)
+    """
+
+    signatures = {}
+
+    for file in Path(directory).rglob(ext):
+        try:
+            signatures[str(file)] = get_file_signature(file)
+        except FileNotFoundError:
+            continue
+
+    return signatures
+
+
+def diff_signatures(
+    previous: Signatures, current: Signatures
+) -> Tuple[Set[str], Set[str]]:
+    """
+    Сравнение двух наборов сигнатур файлов
+
+    Args:
+        previous (Signatures): Предыдущие сигнатуры
+        current (Signatures): Текущие сигнатуры
+
+    Returns:
+        Tuple[Set[str], Set[str]]:
+            - Set[str]: Новые и измененные файлы
+            - Set[str]: Удаленные файлы
+    """
+
+    changed = {path for path, sig in current.items() if previous.get(path) != sig}
+    removed = set(previous) - set(current)
+
+    return changed, removed
+
+
+class ArenaTailReader:
+    """
+    Чтение только дописанных в конец CSV файлов с оценками строк
+    """
+
+    def __init__(self) -> None:
+        self._offsets: Dict[str, int] = {}
+        self._headers: Dict[str, List[str]] = {}
+
+    def prime(self, signatures: Signatures) -> None:
+        """
+        Запоминание текущих размеров файлов: уже прочитанные строки повторно не читаются
+
+        Args:
+            signatures (Signatures): Сигнатуры CSV файлов с оценками
+        """
+
+        self._offsets = {path: sig["size"] for path, sig in signatures.items()}
+        self._headers.clear()
+
+    @staticmethod
+    def _read_header(path: str) -> List[str]:
+        with open(path, "r", encoding="utf-8-sig", newline="") as file:
+            return next(csv.reader(file, delimiter=";"), [])
+
+    def read_appended(self, path: str) -> Optional[List[Dict[str, str]]]:
+        """
+        Чтение строк, дописанных в файл после предыдущего чтения. Незавершенная последняя
+        строка остается до следующего чтения
+
+        Args:
+            path (str): Путь к CSV файлу с оценками
+
+        Returns:
+            Optional[List[Dict[str, str]]]: Новые строки или None, если файл был перезаписан
+        """
+
+        offset = self._offsets.get(path, 0)
+
+        with open(path, "rb") as file:
+            size = file.seek(0, os.SEEK_END)
+
+            if size < offset:
+                self._offsets.pop(path, None)
+                return None
+
+            file.seek(offset)
+            data = file.read(size - offset)
+
+        end = data.rfind(b"\n") + 1
+
+        if not end:
+            return []
+
+        self._offsets[path] = offset + end
+        text = data[:end].decode("utf-8-sig" if offset == 0 else "utf-8")
+        rows = [row for row in csv.reader(text.splitlines(), delimiter=";") if row]
+
+        if offset == 0 and rows:
+            self._headers[path] = rows.pop(0)
+
+        header = self._headers.get(path)
+
+        if header is None:
+            header = self._headers[path] = self._read_header(path)
+
+        return [dict(zip(header, row)) for row in rows]
+
+
+class _DirtyHandler(FileSystemEventHandler):
+    def __init__(self, watcher: "DataWatcher", kind: str) -> None:
+        self.watcher = watcher
+        self.kind = kind
+
+    def on_any_event(self, event: Any) -> None:
+        if not event.is_directory:
+            self.watcher.mark_dirty(self.kind)
+
+
+class DataWatcher:
+    """
+    Наблюдение за директориями StaticPaths.VSA, StaticPaths.SUBJECTS и StaticPaths.ARENA
+    с инкрементальным обновлением данных приложения.
+
+    При наличии watchdog директории проверяются только после уведомлений файловой системы,
+    иначе - опросом раз в interval секунд
+    """
+
+    def __init__(
+        self, data_context: Any, interval: float = 2.0, backend: str = "auto"
+    ) -> None:
+        config = data_context.config
+
+        self.data_context = data_context
+        self.interval = interval
+        self.directories = {
+            "vsa": (config.StaticPaths_VSA, "*.csv"),
+            "subjects": (config.StaticPaths_SUBJECTS, "*.xlsx"),
+        }
+
+        # CSV файлы с оценками дописываются только при хранилище оценок в CSV
+        if config.RatingsStore_BACKEND == "csv":
+            self.directories["arena"] = (config.StaticPaths_ARENA, "*.csv")
+
+        if backend not in ("auto", "watchdog", "polling"):
+            raise ValueError(f"Неизвестный способ наблюдения за файлами: {backend}")
+
+        if backend != "polling" and Observer is None:
+            print(
+                "Пакет watchdog не установлен: изменения файлов обнаруживаются опросом "
+                f"директорий раз в {interval} секунд"
+            )
+
+        self.backend = (
+            "watchdog" if backend != "polling" and Observer is not None else "polling"
+        )
+
+        self._signatures: Dict[str, Signatures] = {}
+        self._arena = ArenaTailReader()
+
+        self._dirty: Set[str] = set()
+        self._dirty_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._observer: Optional[Any] = None
+
+    def prime(self) -> None:
+        """
+        Запоминание текущего состояния директорий. Вызывается до загрузки данных, чтобы
+        изменения во время загрузки были применены после нее
+        """
+
+        self._signatures = {
+            kind: scan_directory(directory, ext)
+            for kind, (directory, ext) in self.directories.items()
+        }
+
+        if "arena" in self._signatures:
+            self._arena.prime(self._signatures["arena"])
+
+    def mark_dirty(self, kind: str) -> None:
+        with self._dirty_lock:
+            self._dirty.add(kind)
+
+    def start(self) -> None:
+        """
+        Запуск наблюдения в фоновом потоке
+        """
+
+        if self._thread is not None:
+            return
+
+        if self.backend == "watchdog":
+            self._observer = Observer()
+
+            for kind, (directory, _) in self.directories.items():
+                if Path(directory).is_dir():
+                    self._observer.schedule(
+                        _DirtyHandler(self, kind), str(directory), recursive=True
+                    )
+
+            self._observer.daemon = True
+            self._observer.start()
+
+        self._thread = threading.Thread(
+            target=self._run, name="data-watcher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Остановка наблюдения
+        """
+
+        self._stop.set()
+
+        if self._observer is not None:
+            self._observer.stop()
+
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            if self.backend == "polling":
+                kinds = set(self.directories)
+            else:
+                with self._dirty_lock:
+                    kinds, self._dirty = self._dirty, set()
+
+            try:
+                self.check(kinds)
+
+                # Оценки в SQLite записываются без изменения файлов наблюдаемых директорий
+                if "arena" not in self.directories:
+                    self.data_context.sync_ratings()
+            except Exception as e:
+                print(f"Ошибка обновления данных: {e}")
+
+    def check(self, kinds: Optional[Set[str]] = None) -> Set[str]:
+        """
+        Проверка директорий и применение изменений
+
+        Args:
+            kinds (Optional[Set[str]]): Проверяемые директории (vsa, subjects, arena). По умолчанию - все
+
+        Returns:
+            Set[str]: Директории, в которых были изменения
+        """
+
+        updated = set()
+
+        for kind in self.directories:
+            if kinds is not None and kind not in kinds:
+                continue
+
+            directory, ext = self.directories[kind]
+            current = scan_directory(directory, ext)
+            changed, removed = diff_signatures(self._signatures.get(kind, {}), current)
+
+            if not changed and not removed:
+                continue
+
+            directory_listing_cache.invalidate(directory)
+            getattr(self, f"_apply_{kind}")(changed, removed, current)
+            self._signatures[kind] = current
+            updated.add(kind)
+
+        return updated
+
+    def _apply_vsa(self, changed: Set[str], removed: Set[str], _: Signatures) -> None:
+        self.data_context.reload_vsa(changed | removed)
+
+    def _apply_subjects(self, changed: Set[str], *_: Any) -> None:
+        # Удаленные файлы исключаются из справочника по списку файлов директории
+        self.data_context.reload_subjects(changed)
+
+    def _apply_arena(
+        self, changed: Set[str], removed: Set[str], current: Signatures
+    ) -> None:
+        if not removed:
+            appended = {path: self._arena.read_appended(path) for path in changed}
+
+            if all(rows is not None for rows in appended.values()):
+                for path, rows in appended.items():
+                    self.data_context.add_ratings(Path(path).name, rows)
+                return
+
+        # Файл с оценками удален или перезаписан - индекс оценок строится заново
+        self._arena.prime(current)
+        self.data_context.reload_ratings()
@@ -15,3 +15,22 @@ STEPS_TEMPLATE = """\
 STEP_1 = STEPS_TEMPLATE.format(text=config_data.InformationMessages_STEP_1)
 
 STEP_2 = STEPS_TEMPLATE.format(text=config_data.InformationMessages_STEP_2)
+
+
+def get_step_2(remaining: int = None) -> str:
+    """
+    Заголовок шага оценки с количеством вакансий, которые пользователю осталось оценить
+
+    Args:
+        remaining (int): Количество оставшихся вакансий. По умолчанию не указывается
+
+    Returns:
+        str: HTML заголовка
+    """
+
+    if remaining is None:
+        return STEP_2
+
+    return STEPS_TEMPLATE.format(
+        text=config_data.InformationMessages_STEP_2_REMAINING.format(remaining)
+    )
@@ -1,51 +1,61 @@
 """
 File: auth.py
 Author: Dmitry Ryumin
-Description: Event handler for Gradio app to change auth.
+Description: Client-side and server-side validation of the auth form for Gradio app.
 License: MIT License
 """
 
+import json
+from typing import Optional
+
 # Importing necessary components for the Gradio app
 from app.config import config_data
-from app.components import (
-    button,
-    html_message,
-)
-
-
-def event_handler_auth(surname, username, dropdown_user):
-    surname = surname.strip()
-    username = username.strip()
-
-    if surname and username and dropdown_user:
-        return (
-            button(
-                value=config_data.OtherMessages_AUTH,
-                interactive=True,
-                scale=1,
-                icon=config_data.StaticPaths_IMAGES + "auth.ico",
-                visible=True,
-                elem_classes="auth",
-            ),
-            html_message(
-                message=config_data.InformationMessages_NOTI_AUTH[1],
-                error=False,
-                visible=True,
-            ),
-        )
-    else:
-        return (
-            button(
-                value=config_data.OtherMessages_AUTH,
-                interactive=False,
-                scale=1,
-                icon=config_data.StaticPaths_IMAGES + "auth.ico",
-                visible=True,
-                elem_classes="auth",
-            ),
-            html_message(
-                message=config_data.InformationMessages_NOTI_AUTH[0],
-                error=True,
-                visible=True,
-            ),
-        )
+from app.components import html_message_value
+
+
+def validate_auth(surname: str, username: str, dropdown_user: str) -> Optional[str]:
+    """
+    Проверка персональных данных на сервере перед входом
+
+    Args:
+        surname (str): Фамилия
+        username (str): Имя
+        dropdown_user (str): Принадлежность
+
+    Returns:
+        Optional[str]: Сообщение об ошибке или None, если все данные заполнены
+    """
+
+    if (surname or "").strip() and (username or "").strip() and dropdown_user:
+        return None
+
+    return config_data.InformationMessages_NOTI_AUTH[0]
+
+
+def get_auth_js() -> str:
+    """
+    Формирование функции JavaScript, которая в браузере включает кнопку входа и показывает
+    сообщение при изменении персональных данных, без обращения к серверу
+
+    Returns:
+        str: Функция JavaScript для аргумента js события Gradio
+    """
+
+    messages = [
+        html_message_value(config_data.InformationMessages_NOTI_AUTH[0], error=True),
+        html_message_value(config_data.InformationMessages_NOTI_AUTH[1], error=False),
+    ]
+
+    return f"""
+    (surname, username, dropdown_user) => {{
+        const messages = {json.dumps(messages, ensure_ascii=False)};
+        const valid = Boolean(
+            (surname || "").trim() && (username || "").trim() && dropdown_user
+        );
+
+        return [
+            {{__type__: "update", interactive: valid}},
+            {{__type__: "update", value: messages[Number(valid)], visible: true}},
+        ];
+    }}
+    """
@@ -5,28 +5,25 @@ Description: Event handler for Gradio app to calculate rating.
 License: MIT License
 """
 
-import time
-import math
-import pandas as pd
 from pathlib import Path
+from typing import List
 import gradio as gr
 
 # Importing necessary components for the Gradio app
 from app.config import config_data
-from app.data_init import csv_vsa_files, xlsx_unique_subjects
-from app.rating_utils import get_rows_to_evaluate
-from app.utils import (
-    get_csv_files,
-    parse_course_data,
-    randomize_results,
-    wrap_subjects,
-)
-from app.components import (
-    dataframe,
-    textbox_create_ui,
-    dropdown_create_ui,
-    button,
-    html_message,
+from app.data_init import data_context
+from app.event_handlers.auth import validate_auth
+from app.event_handlers.dropdown_rating import validate_rating
+from app.event_handlers.readiness import ensure_data_ready
+from app.metrics import stage_timer
+from app.rating_utils import pop_next_from_queue
+from app.ratings_ledger import make_rated_key
+from app.ratings_store import RatingsStoreError
+from app.component_updates import (
+    no_vacancy_updates,
+    rating_reset_updates,
+    step_2_update,
+    vacancy_updates,
 )
 
 
@@ -38,9 +35,10 @@ def event_handler_calculate_rating(
     vacancy_id: int,
     dropdown_rating_a: int,
     dropdown_rating_b: int,
+    evaluation_queue: List[List[str]],
 ):
     """
-    Обработчик события, который сохраняет рейтинг в CSV файл
+    Обработчик события, который сохраняет рейтинг в хранилище оценок
 
     Args:
         surname (str): Имя
@@ -50,198 +48,86 @@ def event_handler_calculate_rating(
         vacancy_id (int): ID вакансии, которая оценивается
         dropdown_rating_a (int): Оценка для первой метрики
         dropdown_rating_b (int): Оценка для второй метрики
+        evaluation_queue (List[List[str]]): Очередь вакансий пользователя [путь к файлу, ID]
     """
 
-    output_dir_path = Path(config_data.StaticPaths_ARENA)
-    csv_vsa_path = Path(csv_vsa_file)
-
-    filename = csv_vsa_path.name
+    message = validate_auth(surname, username, dropdown_user) or validate_rating(
+        dropdown_rating_a, dropdown_rating_b
+    )
+    if message:
+        raise gr.Error(message)
 
-    output_file_path = output_dir_path / filename
+    ensure_data_ready()
 
-    output_dir_path.mkdir(parents=True, exist_ok=True)
+    corpus = data_context.corpus
 
-    new_data = {
-        "ID": [vacancy_id],
-        "SURNAME": [surname],
-        "USERNAME": [username],
-        "AFFILIATION": [dropdown_user],
-        "SBERT": [dropdown_rating_a],
-        "SBERT_LLM": [dropdown_rating_b],
-    }
+    # Оцениваться может только вакансия из набора данных, а не путь и ID из запроса в обход интерфейса
+    if make_rated_key(csv_vsa_file, vacancy_id) not in corpus.row_index:
+        raise gr.Error(config_data.InformationMessages_NOTI_UNKNOWN_VACANCY)
 
-    new_df = pd.DataFrame(new_data)
+    filename = Path(csv_vsa_file).name
 
-    if output_file_path.exists():
-        new_df.to_csv(
-            output_file_path,
-            mode="a",
-            header=False,
-            index=False,
-            encoding="utf-8-sig",
-            sep=";",
+    # Оценка записывается только один раз, даже если вакансия открыта в нескольких вкладках
+    try:
+        data_context.submit_rating(
+            surname,
+            username,
+            dropdown_user,
+            filename,
+            vacancy_id,
+            dropdown_rating_a,
+            dropdown_rating_b,
         )
+    except RatingsStoreError:
+        # Оценка не сохранена: пользователь остается на текущей вакансии и может повторить
+        raise gr.Error(config_data.InformationMessages_NOTI_RATING_NOT_SAVED)
+
+    with stage_timer("row_selection"):
+        if config_data.Scheduler_MODE != "round_robin":
+            next_key_to_evaluate = data_context.assign_next_key(
+                surname, username, dropdown_user, corpus
+            )
+        else:
+            next_key_to_evaluate, evaluation_queue = pop_next_from_queue(
+                evaluation_queue,
+                corpus.row_index,
+                data_context.ratings_ledger,
+                surname,
+                username,
+                dropdown_user,
+            )
+
+    if next_key_to_evaluate is None:
+        # Все вакансии уже оценены пользователем или распределены между другими участниками
+        vacancy = rating = no_vacancy_updates()
     else:
-        new_df.to_csv(
-            output_file_path,
-            mode="w",
-            header=True,
-            index=False,
-            encoding="utf-8-sig",
-            sep=";",
+        next_vsa_payload = data_context.get_vacancy_payload(
+            *next_key_to_evaluate, corpus
         )
 
-    start_time = time.time()
-    ratings_files = get_csv_files(config_data.StaticPaths_ARENA)
-    end_time = time.time()
-    execution_time = end_time - start_time
-    print(f"Время выполнения 1: {execution_time:.3f} секунд")
-
-    rows_to_evaluate = get_rows_to_evaluate(
-        csv_vsa_files,
-        ratings_files,
-        config_data.Settings_EVALUATE_LIMIT,
-        surname,
-        username,
-        dropdown_user,
-    )
+        vacancy = vacancy_updates(next_vsa_payload)
+        rating = rating_reset_updates()
 
-    if rows_to_evaluate:
-        next_row_to_evaluate = rows_to_evaluate[0]
-        next_vsa_dataframe_headers = list(next_row_to_evaluate.keys())
-        next_vsa_row = pd.Series(next_row_to_evaluate)
-
-        state = {
-            "random_order": None,
-            "dataframe_a": wrap_subjects(
-                parse_course_data(next_vsa_row[next_vsa_dataframe_headers[7]], [2, 3]),
-                xlsx_unique_subjects,
-            ),
-            "dataframe_b": wrap_subjects(
-                parse_course_data(
-                    next_vsa_row[next_vsa_dataframe_headers[6]], None, True
-                ),
-                xlsx_unique_subjects,
-            ),
-        }
-
-        parsed_next_dataframe_a, headers_a, parsed_next_dataframe_b, headers_b = (
-            randomize_results(config_data, state)
+        # Следующая вакансия готовится, пока пользователь оценивает текущую
+        data_context.prefetch_next(
+            surname, username, dropdown_user, evaluation_queue, corpus
         )
 
-        if isinstance(next_vsa_row["KeySkills"], str):
-            key_skills = [
-                item.strip()
-                for item in next_vsa_row["KeySkills"].split(",")
-                if item.strip()
-            ]
-            noti_keyskills_visible = False
-        elif math.isnan(next_vsa_row["KeySkills"]):
-            key_skills = None
-            noti_keyskills_visible = True
-
-        return (
-            textbox_create_ui(
-                value=next_row_to_evaluate["source_file"],
-                type="text",
-                label=None,
-                placeholder=None,
-                info=None,
-                max_lines=1,
-                show_label=False,
-                interactive=False,
-                visible=False,
-                show_copy_button=False,
-                scale=1,
-                container=False,
-            ),
-            textbox_create_ui(
-                value=next_vsa_row["ID"],
-                type="text",
-                label=None,
-                placeholder=None,
-                info=None,
-                max_lines=1,
-                show_label=False,
-                interactive=False,
-                visible=False,
-                show_copy_button=False,
-                scale=1,
-                container=False,
-            ),
-            textbox_create_ui(
-                value=next_vsa_row["Name"],
-                type="text",
-                label=None,
-                placeholder=None,
-                info=None,
-                max_lines=1,
-                show_label=False,
-                interactive=False,
-                visible=True,
-                show_copy_button=False,
-                scale=1,
-                container=False,
-            ),
-            gr.HTML(
-                value=next_vsa_row["Description"], elem_classes="vacancy_description"
-            ),
-            dropdown_create_ui(
-                label=config_data.Labels_DROPDOWN_KEYSKILLS,
-                info=config_data.InformationMessages_DROPDOWN_KEYSKILLS,
-                choices=key_skills,
-                value=key_skills,
-                multiselect=True,
-                interactive=False,
-                visible=not noti_keyskills_visible,
-                elem_classes="dropdown-keyskills",
-            ),
-            html_message(
-                message=config_data.InformationMessages_NOTI_KEYSKILLS,
-                error=True,
-                visible=noti_keyskills_visible,
-            ),
-            dataframe(
-                headers=headers_a,
-                values=parsed_next_dataframe_a,
-                label=config_data.Labels_RESULT_A,
-                show_label=True,
-                visible=True,
-            ),
-            dataframe(
-                headers=headers_b,
-                values=parsed_next_dataframe_b,
-                label=config_data.Labels_RESULT_B,
-                show_label=True,
-                visible=True,
-            ),
-            dropdown_create_ui(
-                label=f"{config_data.Labels_DROPDOWN_RATING} {config_data.Settings_RATING_SCALE}",
-                info=config_data.InformationMessages_DROPDOWN_RATING_INFO,
-                choices=range(1, config_data.Settings_RATING_SCALE + 1),
-                value=None,
-                visible=True,
-                elem_classes="dropdown-container",
-            ),
-            dropdown_create_ui(
-                label=f"{config_data.Labels_DROPDOWN_RATING} {config_data.Settings_RATING_SCALE}",
-                info=config_data.InformationMessages_DROPDOWN_RATING_INFO,
-                choices=range(1, config_data.Settings_RATING_SCALE + 1),
-                value=None,
-                visible=True,
-                elem_classes="dropdown-container",
-            ),
-            button(
-                value=config_data.OtherMessages_CALCULATE_RATING,
-                interactive=False,
-                scale=1,
-                icon=config_data.StaticPaths_IMAGES + "calculate_rating.ico",
-                visible=True,
-                elem_classes="calculate_rating",
-            ),
-            html_message(
-                message=config_data.InformationMessages_NOTI_CALCULATE_RATING[0],
-                error=True,
-                visible=True,
-            ),
-        )
+    return (
+        vacancy["csv_vsa_file"],
+        vacancy["vacancy_id"],
+        vacancy["vacancy_name"],
+        vacancy["vacancy_description"],
+        vacancy["dropdown_keyskills"],
+        vacancy["noti_keyskills"],
+        vacancy["res_a"],
+        vacancy["res_b"],
+        rating["dropdown_rating_a"],
+        rating["dropdown_rating_b"],
+        rating["calculate_rating"],
+        rating["notifications_calculate"],
+        step_2_update(
+            corpus, data_context.ratings_ledger, surname, username, dropdown_user
+        ),
+        evaluation_queue,
+    )
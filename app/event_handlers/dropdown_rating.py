@@ -1,80 +1,101 @@
 """
 File: dropdown_rating.py
 Author: Dmitry Ryumin
-Description: Event handler for Gradio app to dropdown rating.
+Description: Client-side and server-side validation of the dropdown ratings for Gradio app.
 License: MIT License
 """
 
+import json
+from typing import Any, Optional
+
 # Importing necessary components for the Gradio app
 from app.config import config_data
-from app.components import (
-    button,
-    html_message,
-)
-
-
-def event_handler_dropdown_rating(dropdown_rating_a, dropdown_rating_b):
-    if not dropdown_rating_a and not dropdown_rating_b:
-        return (
-            button(
-                value=config_data.OtherMessages_CALCULATE_RATING,
-                interactive=False,
-                scale=1,
-                icon=config_data.StaticPaths_IMAGES + "calculate_rating.ico",
-                visible=True,
-                elem_classes="calculate_rating",
-            ),
-            html_message(
-                message=config_data.InformationMessages_NOTI_CALCULATE_RATING[0],
-                error=True,
-                visible=True,
-            ),
-        )
-    elif not dropdown_rating_a and dropdown_rating_b:
-        return (
-            button(
-                value=config_data.OtherMessages_CALCULATE_RATING,
-                interactive=False,
-                scale=1,
-                icon=config_data.StaticPaths_IMAGES + "calculate_rating.ico",
-                visible=True,
-                elem_classes="calculate_rating",
-            ),
-            html_message(
-                message=config_data.InformationMessages_NOTI_CALCULATE_RATING[1],
-                error=True,
-                visible=True,
-            ),
-        )
-    elif dropdown_rating_a and not dropdown_rating_b:
-        return (
-            button(
-                value=config_data.OtherMessages_CALCULATE_RATING,
-                interactive=False,
-                scale=1,
-                icon=config_data.StaticPaths_IMAGES + "calculate_rating.ico",
-                visible=True,
-                elem_classes="calculate_rating",
-            ),
-            html_message(
-                message=config_data.InformationMessages_NOTI_CALCULATE_RATING[2],
-                error=True,
-                visible=True,
-            ),
-        )
-    else:
-        return (
-            button(
-                value=config_data.OtherMessages_CALCULATE_RATING,
-                interactive=True,
-                scale=1,
-                icon=config_data.StaticPaths_IMAGES + "calculate_rating.ico",
-                visible=True,
-                elem_classes="calculate_rating",
-            ),
-            html_message(
-                message=config_data.InformationMessages_NOTI_CALCULATE_RATING[3],
-                error=True,
-                visible=False,
-            ),
+from app.components import html_message_value
+
+
+def get_rating_message_index(dropdown_rating_a: Any, dropdown_rating_b: Any) -> int:
+    """
+    Получение номера сообщения InformationMessages.NOTI_CALCULATE_RATING
+
+    Args:
+        dropdown_rating_a (Any): Оценка результата объединения А
+        dropdown_rating_b (Any): Оценка результата объединения Б
+
+    Returns:
+        int: 0 - нет оценок, 1 - нет оценки А, 2 - нет оценки Б, 3 - все оценки выставлены
+    """
+
+    return 3 - 2 * (not dropdown_rating_a) - (not dropdown_rating_b)
+
+
+def is_rating_in_scale(value: Any) -> bool:
+    """
+    Проверка, что оценка - целое число от 1 до Settings.RATING_SCALE
+
+    Args:
+        value (Any): Оценка
+
+    Returns:
+        bool: True, если оценка входит в шкалу
+    """
+
+    return (
+        isinstance(value, int)
+        and not isinstance(value, bool)
+        and 1 <= value <= config_data.Settings_RATING_SCALE
+    )
+
+
+def validate_rating(dropdown_rating_a: Any, dropdown_rating_b: Any) -> Optional[str]:
+    """
+    Проверка оценок на сервере перед сохранением: значения, отправленные в обход интерфейса,
+    должны входить в шкалу оценок
+
+    Args:
+        dropdown_rating_a (Any): Оценка результата объединения А
+        dropdown_rating_b (Any): Оценка результата объединения Б
+
+    Returns:
+        Optional[str]: Сообщение об ошибке или None, если все оценки выставлены
+    """
+
+    index = get_rating_message_index(dropdown_rating_a, dropdown_rating_b)
+
+    if index != 3:
+        return config_data.InformationMessages_NOTI_CALCULATE_RATING[index]
+
+    if not (
+        is_rating_in_scale(dropdown_rating_a) and is_rating_in_scale(dropdown_rating_b)
+    ):
+        return config_data.InformationMessages_NOTI_RATING_SCALE.format(
+            config_data.Settings_RATING_SCALE
         )
+
+    return None
+
+
+def get_dropdown_rating_js() -> str:
+    """
+    Формирование функции JavaScript, которая в браузере включает кнопку оценки и показывает
+    сообщение при выборе оценок, без обращения к серверу
+
+    Returns:
+        str: Функция JavaScript для аргумента js события Gradio
+    """
+
+    messages = [
+        html_message_value(message, error=True)
+        for message in config_data.InformationMessages_NOTI_CALCULATE_RATING
+    ]
+
+    return f"""
+    (dropdown_rating_a, dropdown_rating_b) => {{
+        const messages = {json.dumps(messages, ensure_ascii=False)};
+        const index = 3 - 2 * Number(!dropdown_rating_a) - Number(!dropdown_rating_b);
+
+        return [
+            {{__type__: "update", interactive: index === 3}},
+            {{__type__: "update", value: messages[index], visible: index !== 3}},
+        ];
+    }}
+    """
@@ -6,13 +6,36 @@ License: MIT License
 """
 
 import gradio as gr
+from typing import Any, Dict
 
 # Importing necessary components for the Gradio app
 # from app.event_handlers.page_refresh import event_handler_page_refresh
-from app.event_handlers.auth import event_handler_auth
+from app.config import config_data
+from app.event_handlers.auth import get_auth_js
 from app.event_handlers.login import event_handler_login
-from app.event_handlers.dropdown_rating import event_handler_dropdown_rating
+from app.event_handlers.dropdown_rating import get_dropdown_rating_js
 from app.event_handlers.calculate_rating import event_handler_calculate_rating
+from app.metrics import instrument_handler
+
+
+def get_concurrency(event: str) -> Dict[str, Any]:
+    """
+    Получение параметров конкурентности события из разделов ConcurrencyEvents и ConcurrencyGroups.
+    События одной группы разделяют общий лимит одновременно выполняемых обработчиков
+
+    Args:
+        event (str): Название события в ConcurrencyEvents
+
+    Returns:
+        Dict[str, Any]: Аргументы concurrency_id и concurrency_limit для события Gradio
+    """
+
+    group = getattr(config_data, f"ConcurrencyEvents_{event}")
+
+    return {
+        "concurrency_id": group,
+        "concurrency_limit": getattr(config_data, f"ConcurrencyGroups_{group}"),
+    }
 
 
 def setup_app_event_handlers(
@@ -36,6 +59,7 @@ def setup_app_event_handlers(
     dropdown_rating_b,
     calculate_rating,
     notifications_calculate,
+    evaluation_queue,
     # gradio_app,
 ):
     # Events
@@ -63,18 +87,19 @@ def setup_app_event_handlers(
     #         notifications_calculate,
     #     ],
     # )
+    # Проверка заполнения формы выполняется в браузере, сервер проверяет данные при входе
     gr.on(
         triggers=[surname.change, username.change, dropdown_user.change],
-        fn=event_handler_auth,
+        fn=None,
         inputs=[surname, username, dropdown_user],
         outputs=[
             auth,
             notifications_auth,
         ],
-        queue=True,
+        js=get_auth_js(),
     )
     auth.click(
-        fn=event_handler_login,
+        fn=instrument_handler(event_handler_login),
         inputs=[surname, username, dropdown_user],
         outputs=[
             surname,
@@ -97,18 +122,21 @@ def setup_app_event_handlers(
             dropdown_rating_b,
             calculate_rating,
             notifications_calculate,
+            evaluation_queue,
         ],
         queue=True,
+        **get_concurrency("LOGIN"),
     )
+    # Проверка выбора оценок выполняется в браузере, сервер проверяет оценки при сохранении
     gr.on(
         triggers=[dropdown_rating_a.change, dropdown_rating_b.change],
-        fn=event_handler_dropdown_rating,
+        fn=None,
         inputs=[dropdown_rating_a, dropdown_rating_b],
         outputs=[calculate_rating, notifications_calculate],
-        queue=True,
+        js=get_dropdown_rating_js(),
     )
     calculate_rating.click(
-        fn=event_handler_calculate_rating,
+        fn=instrument_handler(event_handler_calculate_rating),
         inputs=[
             surname,
             username,
@@ -117,6 +145,7 @@ def setup_app_event_handlers(
             vacancy_id,
             dropdown_rating_a,
             dropdown_rating_b,
+            evaluation_queue,
         ],
         outputs=[
             csv_vsa_file,
@@ -131,6 +160,9 @@ def setup_app_event_handlers(
             dropdown_rating_b,
             calculate_rating,
             notifications_calculate,
+            step_2,
+            evaluation_queue,
         ],
         queue=True,
+        **get_concurrency("CALCULATE_RATING"),
     )
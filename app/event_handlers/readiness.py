@@ -0,0 +1,26 @@
+"""
+File: readiness.py
+Author: Dmitry Ryumin
+Description: Readiness check of the application data for event handlers.
+License: MIT License
+"""
+
+import gradio as gr
+
+# Importing necessary components for the Gradio app
+from app.config import config_data
+from app.data_init import data_context
+
+
+def ensure_data_ready() -> None:
+    """
+    Ожидание загрузки данных приложения. Если данные не готовы за Settings.READY_TIMEOUT секунд,
+    пользователю показывается сообщение о текущем этапе загрузки
+    """
+
+    data_context.start()
+
+    if not data_context.wait_ready(config_data.Settings_READY_TIMEOUT):
+        raise gr.Error(
+            config_data.InformationMessages_NOTI_LOADING.format(data_context.stage)
+        )
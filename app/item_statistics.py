@@ -0,0 +1,204 @@
+"""
+File: item_statistics.py
+Author: Dmitry Ryumin
+Description: Streaming per-vacancy statistics of the SBERT and SBERT_LLM ratings.
+License: MIT License
+"""
+
+import math
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+# Importing necessary components for the Gradio app
+from app.ratings_ledger import RatedKey
+
+
+@dataclass
+class RunningStats:
+    """
+    Среднее и дисперсия, обновляемые за O(1) по алгоритму Уэлфорда
+    """
+
+    n: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    def add(self, value: float) -> None:
+        self.n += 1
+        delta = value - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self) -> float:
+        """
+        Несмещенная выборочная дисперсия (NaN, если наблюдений меньше двух)
+        """
+
+        return self.m2 / (self.n - 1) if self.n > 1 else math.nan
+
+    @property
+    def stderr(self) -> float:
+        """
+        Стандартная ошибка среднего (бесконечность, если наблюдений меньше двух)
+        """
+
+        return math.sqrt(self.variance / self.n) if self.n > 1 else math.inf
+
+
+@dataclass
+class ItemStatistics:
+    """
+    Статистика оценок одной вакансии: системы А (SBERT), Б (SBERT_LLM) и их разности А - Б
+    """
+
+    a: RunningStats = field(default_factory=RunningStats)
+    b: RunningStats = field(default_factory=RunningStats)
+    diff: RunningStats = field(default_factory=RunningStats)
+
+    def add(self, rating_a: float, rating_b: float) -> None:
+        self.a.add(rating_a)
+        self.b.add(rating_b)
+        self.diff.add(rating_a - rating_b)
+
+
+def parse_rating(value: Any) -> Optional[float]:
+    """
+    Преобразование оценки из хранилища или обработчика в число
+
+    Args:
+        value (Any): Оценка (число, строка или NaN)
+
+    Returns:
+        Optional[float]: Оценка или None, если оценка не указана
+    """
+
+    try:
+        rating = float(value)
+    except (TypeError, ValueError):
+        return None
+
+    return None if math.isnan(rating) else rating
+
+
+class ItemStatisticsIndex:
+    """
+    Потоковая статистика оценок по всем вакансиям
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._items: Dict[RatedKey, ItemStatistics] = {}
+
+    def add(self, key: RatedKey, rating_a: Any, rating_b: Any) -> bool:
+        """
+        Учет одной оценки вакансии
+
+        Args:
+            key (RatedKey): Ключ вакансии
+            rating_a (Any): Оценка системы А (SBERT)
+            rating_b (Any): Оценка системы Б (SBERT_LLM)
+
+        Returns:
+            bool: True, если обе оценки указаны и учтены
+        """
+
+        rating_a, rating_b = parse_rating(rating_a), parse_rating(rating_b)
+
+        if rating_a is None or rating_b is None:
+            return False
+
+        with self._lock:
+            self._items.setdefault(key, ItemStatistics()).add(rating_a, rating_b)
+
+        return True
+
+    def replace(self, other: "ItemStatisticsIndex") -> None:
+        """
+        Замена всей статистики статистикой другого индекса (после повторного чтения оценок)
+
+        Args:
+            other (ItemStatisticsIndex): Новая статистика
+        """
+
+        with self._lock:
+            self._items = other._items
+
+    def get_diff(self, key: RatedKey) -> RunningStats:
+        """
+        Получение копии статистики разности оценок А - Б для вакансии
+
+        Args:
+            key (RatedKey): Ключ вакансии
+
+        Returns:
+            RunningStats: Число оценок, среднее и сумма квадратов отклонений разности
+        """
+
+        with self._lock:
+            item = self._items.get(key)
+
+            if item is None:
+                return RunningStats()
+
+            return RunningStats(item.diff.n, item.diff.mean, item.diff.m2)
+
+    @staticmethod
+    def _summarize(item: ItemStatistics) -> Dict[str, float]:
+        return {
+            "n": item.diff.n,
+            "mean_a": item.a.mean,
+            "variance_a": item.a.variance,
+            "mean_b": item.b.mean,
+            "variance_b": item.b.variance,
+            "mean_diff": item.diff.mean,
+            "stderr_diff": item.diff.stderr,
+        }
+
+    def summary(self, key: RatedKey) -> Dict[str, float]:
+        """
+        Сводка статистики вакансии
+
+        Args:
+            key (RatedKey): Ключ вакансии
+
+        Returns:
+            Dict[str, float]: Число оценок, средние и дисперсии систем, средняя разность
+                и ее стандартная ошибка
+        """
+
+        with self._lock:
+            return self._summarize(self._items.get(key, ItemStatistics()))
+
+    def summaries(self) -> Dict[RatedKey, Dict[str, float]]:
+        """
+        Сводки статистики всех вакансий, у которых есть оценки
+
+        Returns:
+            Dict[RatedKey, Dict[str, float]]: Ключ вакансии -> сводка, как в summary
+        """
+
+        with self._lock:
+            return {key: self._summarize(item) for key, item in self._items.items()}
+
+    def export(self) -> List[Dict[str, Any]]:
+        """
+        Сводки статистики всех вакансий в виде записей для JSON. Неопределенные значения
+        (NaN, например дисперсия по одной оценке) заменяются на None
+
+        Returns:
+            List[Dict[str, Any]]: Записи с полями source_file, id и полями сводки
+        """
+
+        return [
+            {
+                "source_file": source_file,
+                "id": vacancy_id,
+                **{
+                    name: value if math.isfinite(value) else None
+                    for name, value in summary.items()
+                },
+            }
+            for (source_file, vacancy_id), summary in self.summaries().items()
+        ]
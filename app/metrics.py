@@ -0,0 +1,376 @@
+"""
+File: metrics.py
+Author: Dmitry Ryumin
+Description: Handler and stage metrics in the Prometheus text exposition format.
+License: MIT License
+"""
+
+import math
+import time
+import functools
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Tuple
+
+# Границы гистограмм задержек в секундах
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+# Метки, которые добавляются ко всем метрикам процесса (номер рабочего процесса)
+_constant_labels: Labels = ()
+
+
+def set_constant_labels(**labels: str) -> None:
+    """
+    Задание меток, которые добавляются ко всем метрикам процесса. В режиме нескольких
+    процессов каждый процесс отдает метрики с меткой worker
+
+    Args:
+        **labels (str): Имена и значения меток
+    """
+
+    global _constant_labels
+
+    _constant_labels = tuple(sorted(labels.items()))
+
+
+def _format_labels(labels: Labels, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = _constant_labels + labels + extra
+
+    if not pairs:
+        return ""
+
+    escaped = (
+        (name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in pairs
+    )
+
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+
+    return repr(float(value))
+
+
+class _Metric:
+    metric_type = ""
+
+    def __init__(self, name: str, documentation: str) -> None:
+        self.name = name
+        self.documentation = documentation
+        self._lock = threading.Lock()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}",
+        ] + self._samples()
+
+
+class Counter(_Metric):
+    """
+    Монотонно возрастающий счетчик
+    """
+
+    metric_type = "counter"
+
+    def __init__(self, name: str, documentation: str) -> None:
+        super().__init__(name, documentation)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            return [
+                f"{self.name}{_format_labels(labels)} {_format_value(value)}"
+                for labels, value in self._values.items()
+            ]
+
+
+class Gauge(_Metric):
+    """
+    Значение, которое может увеличиваться и уменьшаться
+    """
+
+    metric_type = "gauge"
+
+    def __init__(self, name: str, documentation: str) -> None:
+        super().__init__(name, documentation)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[tuple(sorted(labels.items()))] = value
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            return [
+                f"{self.name}{_format_labels(labels)} {_format_value(value)}"
+                for labels, value in self._values.items()
+            ]
+
+
+class Histogram(_Metric):
+    """
+    Гистограмма с накопительными корзинами, суммой и количеством наблюдений
+    """
+
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._values: Dict[Labels, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+
+        with self._lock:
+            counts, total = self._values.setdefault(
+                key, ([0] * len(self.buckets), [0.0])
+            )
+
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+
+            total[0] += value
+
+    def _samples(self) -> List[str]:
+        samples = []
+
+        with self._lock:
+            for labels, (counts, total) in self._values.items():
+                cumulative = 0
+
+                for bound, count in zip(self.buckets, counts):
+                    cumulative += count
+                    le = (("le", _format_value(bound)),)
+                    samples.append(
+                        f"{self.name}_bucket{_format_labels(labels, le)} {cumulative}"
+                    )
+
+                samples.append(
+                    f"{self.name}_sum{_format_labels(labels)} {_format_value(total[0])}"
+                )
+                samples.append(
+                    f"{self.name}_count{_format_labels(labels)} {cumulative}"
+                )
+
+        return samples
+
+
+handler_calls = Counter("arena_handler_calls_total", "Количество вызовов обработчиков")
+handler_errors = Counter(
+    "arena_handler_errors_total", "Количество ошибок в обработчиках"
+)
+handler_in_flight = Gauge(
+    "arena_handler_in_flight", "Количество выполняющихся вызовов обработчиков"
+)
+handler_latency = Histogram(
+    "arena_handler_latency_seconds", "Время выполнения обработчиков"
+)
+stage_latency = Histogram(
+    "arena_stage_latency_seconds", "Время выполнения внутренних этапов"
+)
+stage_errors = Counter(
+    "arena_stage_errors_total", "Количество ошибок во внутренних этапах"
+)
+
+METRICS: List[_Metric] = [
+    handler_calls,
+    handler_errors,
+    handler_in_flight,
+    handler_latency,
+    stage_latency,
+    stage_errors,
+]
+
+
+def instrument_handler(fn: Callable) -> Callable:
+    """
+    Обертка обработчика событий с замером времени, подсчетом ошибок и числа выполняющихся вызовов.
+    Сигнатура обработчика сохраняется, поэтому Gradio передает входные данные как прежде
+
+    Args:
+        fn (Callable): Обработчик событий
+
+    Returns:
+        Callable: Обернутый обработчик
+    """
+
+    handler = fn.__name__.removeprefix("event_handler_")
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        handler_calls.inc(handler=handler)
+        handler_in_flight.inc(handler=handler)
+        start_time = time.perf_counter()
+
+        try:
+            return fn(*args, **kwargs)
+        except Exception:
+            handler_errors.inc(handler=handler)
+            raise
+        finally:
+            handler_latency.observe(time.perf_counter() - start_time, handler=handler)
+            handler_in_flight.dec(handler=handler)
+
+    return wrapper
+
+
+@contextmanager
+def stage_timer(stage: str) -> Iterator[None]:
+    """
+    Замер времени выполнения внутреннего этапа (чтение оценок, выбор строк, подготовка данных, запись)
+
+    Args:
+        stage (str): Название этапа
+    """
+
+    start_time = time.perf_counter()
+
+    try:
+        yield
+    except Exception:
+        stage_errors.inc(stage=stage)
+        raise
+    finally:
+        stage_latency.observe(time.perf_counter() - start_time, stage=stage)
+
+
+def render_metrics() -> str:
+    """
+    Формирование всех метрик в текстовом формате Prometheus
+
+    Returns:
+        str: Метрики
+    """
+
+    return "\n".join(line for metric in METRICS for line in metric.render()) + "\n"
+
+
+def render_cache_metrics(stats: Mapping[str, int]) -> str:
+    """
+    Формирование метрик кэша подготовленных вакансий (RenderCache.stats) в текстовом формате
+    Prometheus
+
+    Args:
+        stats (Mapping[str, int]): Количество попаданий, промахов и элементов в кэше
+
+    Returns:
+        str: Метрики
+    """
+
+    hits = Counter(
+        "arena_render_cache_hits_total", "Количество попаданий в кэш вакансий"
+    )
+    misses = Counter(
+        "arena_render_cache_misses_total", "Количество промахов кэша вакансий"
+    )
+    size = Gauge("arena_render_cache_size", "Количество вакансий в кэше")
+    max_size = Gauge("arena_render_cache_max_size", "Наибольший размер кэша вакансий")
+
+    hits.inc(stats["hits"])
+    misses.inc(stats["misses"])
+    size.set(stats["size"])
+    max_size.set(stats["max_size"])
+
+    metrics = [hits, misses, size, max_size]
+
+    return "\n".join(line for metric in metrics for line in metric.render()) + "\n"
+
+
+def render_coverage_metrics(coverage: Mapping[str, int]) -> str:
+    """
+    Формирование метрик покрытия вакансий оценками (Scheduler.coverage) в текстовом формате
+    Prometheus
+
+    Args:
+        coverage (Mapping[str, int]): Число вакансий, вакансий без оценок, покрытых вакансий и оценок
+
+    Returns:
+        str: Метрики
+    """
+
+    items = Gauge(
+        "arena_scheduler_items", "Количество вакансий для оценки по состоянию"
+    )
+    ratings = Gauge("arena_scheduler_ratings", "Количество учтенных оценок вакансий")
+
+    items.set(coverage["items"], state="all")
+    items.set(coverage["unrated"], state="unrated")
+    items.set(coverage["covered"], state="covered")
+    ratings.set(coverage["ratings"])
+
+    metrics = [items, ratings]
+
+    return "\n".join(line for metric in metrics for line in metric.render()) + "\n"
+
+
+def render_readiness_metrics(status: Mapping[str, Any]) -> str:
+    """
+    Формирование метрик загрузки данных (DataContext.status) в текстовом формате Prometheus.
+    Время этапов загрузки учитывается stage_timer (этапы load_*)
+
+    Args:
+        status (Mapping[str, Any]): Текущий этап, признак готовности и время выполнения этапов
+
+    Returns:
+        str: Метрики
+    """
+
+    ready = Gauge("arena_data_ready", "Данные приложения загружены (1) или нет (0)")
+    stage = Gauge("arena_data_stage", "Текущий этап загрузки данных")
+
+    ready.set(int(status["ready"]))
+    stage.set(1, stage=status["stage"])
+
+    metrics = [ready, stage]
+
+    return "\n".join(line for metric in metrics for line in metric.render()) + "\n"
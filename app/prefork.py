@@ -0,0 +1,180 @@
+"""
+File: prefork.py
+Author: Dmitry Ryumin
+Description: Pre-fork serving mode - data is loaded once and shared by several worker processes.
+License: MIT License
+"""
+
+import gc
+import os
+import signal
+import multiprocessing
+from multiprocessing.connection import wait
+from typing import Any, Callable, Dict, List
+
+# Importing necessary components for the Gradio app
+from app.data_context import DataContext
+from app.metrics import set_constant_labels
+
+
+def get_worker_count(count: int) -> int:
+    """
+    Получение количества рабочих процессов
+
+    Args:
+        count (int): Значение Workers.COUNT (0 - по количеству ядер процессора)
+
+    Returns:
+        int: Количество рабочих процессов
+    """
+
+    if count > 0:
+        return count
+
+    return (
+        len(os.sched_getaffinity(0))
+        if hasattr(os, "sched_getaffinity")
+        else os.cpu_count() or 1
+    )
+
+
+def run_worker(
+    data_context: DataContext,
+    serve: Callable[[str, int], None],
+    host: str,
+    port: int,
+    index: int,
+) -> None:
+    """
+    Рабочий процесс: запуск собственных потоков данных и сервера приложения
+
+    Args:
+        data_context (DataContext): Загруженные до fork данные приложения
+        serve (Callable[[str, int], None]): Запуск сервера приложения на адресе и порту
+        host (str): Адрес рабочего процесса
+        port (int): Порт рабочего процесса
+        index (int): Номер рабочего процесса, который добавляется к метрикам (метка worker)
+    """
+
+    # Обработчик SIGTERM главного процесса заменяется до запуска сервера, который затем
+    # устанавливает собственные обработчики SIGINT и SIGTERM
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+    gc.enable()
+    set_constant_labels(worker=str(index))
+    data_context.after_fork()
+
+    try:
+        serve(host, port)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        data_context.close()
+
+
+class PreforkServer:
+    """
+    Главный процесс: загружает данные один раз, затем запускает через fork рабочие процессы
+    с сервером приложения на портах base_port, base_port + 1, ... Страницы памяти с данными
+    разделяются процессами до первой записи (copy-on-write). Главный процесс не запускает
+    потоков, поэтому fork безопасен, и перезапускает завершившиеся процессы.
+
+    Состояние сессий Gradio хранится в памяти процесса, поэтому запросы распределяет
+    балансировщик нагрузки с привязкой клиента к процессу (например, nginx с hash $remote_addr
+    consistent). Метрики каждого процесса отдаются на его порту с меткой worker
+    """
+
+    def __init__(
+        self,
+        data_context: DataContext,
+        serve: Callable[[str, int], None],
+        host: str,
+        workers: int,
+        base_port: int,
+    ) -> None:
+        self.data_context = data_context
+        self.serve = serve
+        self.host = host
+        self.ports: List[int] = [
+            base_port + n for n in range(get_worker_count(workers))
+        ]
+
+        # Оценки других процессов попадают в индекс оценок только через наблюдение за данными
+        if len(self.ports) > 1 and not data_context.config.Watcher_ENABLED:
+            raise ValueError(
+                "Для нескольких рабочих процессов требуется Watcher.ENABLED = true"
+            )
+
+        self._context = multiprocessing.get_context("fork")
+        self._processes: Dict[int, multiprocessing.Process] = {}
+        self._stopping = False
+
+    def _spawn(self, index: int) -> multiprocessing.Process:
+        process = self._context.Process(
+            target=run_worker,
+            args=(self.data_context, self.serve, self.host, self.ports[index], index),
+            name=f"arena-worker-{index}",
+            daemon=False,
+        )
+        process.start()
+
+        self._processes[index] = process
+
+        return process
+
+    def _stop(self, *_: Any) -> None:
+        self._stopping = True
+
+        for process in self._processes.values():
+            if process.is_alive():
+                process.terminate()
+
+    def run(self) -> None:
+        """
+        Загрузка данных, запуск процессов и ожидание их завершения
+        """
+
+        # Данные загружаются в главном процессе без фонового потока и без наблюдения за файлами
+        self.data_context.load(start_watcher=False)
+        self.data_context.before_fork()
+
+        # Объекты данных исключаются из сборки мусора: иначе сборщик мусора в рабочих
+        # процессах изменяет их заголовки и копирует разделяемые страницы памяти
+        gc.collect()
+        gc.freeze()
+        gc.disable()
+
+        signal.signal(signal.SIGTERM, self._stop)
+
+        for index in range(len(self.ports)):
+            self._spawn(index)
+
+        print(
+            f"Рабочие процессы запущены на {self.host}, порты: "
+            f"{', '.join(map(str, self.ports))}"
+        )
+
+        try:
+            while self._processes:
+                sentinels = {
+                    process.sentinel: index
+                    for index, process in self._processes.items()
+                }
+
+                for sentinel in wait(list(sentinels)):
+                    index = sentinels[sentinel]
+                    process = self._processes.pop(index)
+                    process.join()
+
+                    if not self._stopping:
+                        print(
+                            f"Процесс {process.name} завершился с кодом "
+                            f"{process.exitcode}, перезапуск"
+                        )
+                        self._spawn(index)
+        except KeyboardInterrupt:
+            # SIGINT получают все процессы группы, главный процесс дожидается их завершения
+            self._stopping = True
+
+            for process in self._processes.values():
+                process.join()
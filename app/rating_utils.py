@@ -5,152 +5,207 @@ Description: Utility functions for handling rating evaluation.
 License: MIT License
 """
 
-from typing import List, Dict
+import pandas as pd
+from typing import AbstractSet, Dict, Iterator, List, Optional, Tuple
 
 # Importing necessary components for the Gradio app
-from app.utils import read_csv_file
+from app.ratings_ledger import RatedKey, RatingsLedger, make_rated_key
 
 
-def get_existing_ids(
-    ratings_file: str, surname: str, username: str, affiliation: str
-) -> List[int]:
+def _iter_pending_positions(
+    csv_files: List[str],
+    vsa_dataframes: List[pd.DataFrame],
+    rated_keys: AbstractSet[RatedKey],
+    limit_per_file: int,
+) -> Iterator[Tuple[int, int]]:
     """
-    Получение ID, которые уже были оценены конкретным пользователем (по комбинации фамилии, имени и принадлежности)
+    Перебор позиций (номер файла, номер строки) еще не оцененных строк с чередованием между файлами
 
     Args:
-        ratings_file (str): Путь к CSV файлу с оценками
-        surname (str): Значение фамилии (SURNAME) для фильтрации
-        username (str): Значение имени (USERNAME) для фильтрации
-        affiliation (str): Значение принадлежности (AFFILIATION) для фильтрации
+        csv_files (List[str]): Список путей к CSV файлам с исходными данными
+        vsa_dataframes (List[pd.DataFrame]): Загруженные DataFrame в порядке csv_files
+        rated_keys (AbstractSet[RatedKey]): Ключи (имя файла, ID) уже оцененных вакансий
+        limit_per_file (int): Ограничение на количество строк для оценки из каждого файла
 
-    Returns:
-        List[int]: Список ID, которые уже оценены этим пользователем
+    Yields:
+        Tuple[int, int]: Номер файла и номер строки в нем
     """
 
-    try:
-        ratings_df = read_csv_file(ratings_file)
+    limits = [min(limit_per_file, len(df)) for df in vsa_dataframes]
+
+    for position in range(max(limits, default=0)):
+        for i, df in enumerate(vsa_dataframes):
+            if position >= limits[i]:
+                continue
 
-        # Отбираем только те строки, которые соответствуют комбинации фамилии, имени и принадлежности
-        matching_rows = ratings_df[
-            (ratings_df["SURNAME"] == surname)
-            & (ratings_df["USERNAME"] == username)
-            & (ratings_df["AFFILIATION"] == affiliation)
-        ]
+            # Проверяем, чтобы вакансия не была уже оценена пользователем
+            if make_rated_key(csv_files[i], df["ID"].iat[position]) in rated_keys:
+                continue
 
-        # Возвращаем список ID, которые уже были оценены этим пользователем
-        return matching_rows["ID"].tolist()
-    except FileNotFoundError:
-        return []
+            yield i, position
 
 
-def get_user_ids_by_combination(
-    ratings_files: List[str], surname: str, username: str, affiliation: str
-) -> List[int]:
+def build_row_index(
+    csv_files: List[str], vsa_dataframes: List[pd.DataFrame]
+) -> Dict[RatedKey, Tuple[int, int]]:
     """
-    Получение всех ID для строк, где значения персональных данных равны заданным
+    Построение индекса (имя файла, ID) -> (номер файла, номер строки) для быстрого поиска вакансий
 
     Args:
-        ratings_files (List[str]): Список путей к CSV файлам с оценками
-        surname (str): Значение фамилии (SURNAME) для поиска
-        username (str): Значение имени (USERNAME) для поиска
-        affiliation (str): Значение принадлежности (AFFILIATION) для поиска
+        csv_files (List[str]): Список путей к CSV файлам с исходными данными
+        vsa_dataframes (List[pd.DataFrame]): Загруженные DataFrame в порядке csv_files
 
     Returns:
-        List[int]: Список ID, которые соответствуют найденным пользователям
+        Dict[RatedKey, Tuple[int, int]]: Индекс строк
     """
 
-    matching_ids = []
+    row_index = {}
 
-    if not (surname and username and affiliation):
-        return matching_ids
+    for i, (csv_file, df) in enumerate(zip(csv_files, vsa_dataframes)):
+        for position, vacancy_id in enumerate(df["ID"].tolist()):
+            row_index.setdefault(make_rated_key(csv_file, vacancy_id), (i, position))
 
-    for ratings_file in ratings_files:
-        df = read_csv_file(ratings_file)
+    return row_index
 
-        required_columns = ["SURNAME", "USERNAME", "AFFILIATION", "ID"]
 
-        if not all(col in df.columns for col in required_columns):
-            continue
+def count_rows_to_evaluate(
+    csv_files: List[str],
+    vsa_dataframes: List[pd.DataFrame],
+    ratings_ledger: RatingsLedger,
+    limit_per_file: int,
+    surname: str = None,
+    username: str = None,
+    affiliation: str = None,
+) -> int:
+    """
+    Подсчет количества строк, которые еще осталось оценить, без построения самих строк
 
-        # Находим все строки с совпадающими фамилией, именем и принадлежностью
-        matching_rows = df[
-            (df["SURNAME"] == surname)
-            & (df["USERNAME"] == username)
-            & (df["AFFILIATION"] == affiliation)
-        ]
+    Args:
+        csv_files (List[str]): Список путей к CSV файлам с исходными данными
+        vsa_dataframes (List[pd.DataFrame]): Загруженные DataFrame в порядке csv_files
+        ratings_ledger (RatingsLedger): Индекс уже выставленных оценок
+        limit_per_file (int): Ограничение на количество строк для оценки из каждого файла
+        surname (str): Значение фамилии (SURNAME) для поиска
+        username (str): Значение имени (USERNAME) для поиска
+        affiliation (str): Значение принадлежности (AFFILIATION) для поиска
 
-        # Добавляем все найденные ID
-        matching_ids.extend(matching_rows["ID"].tolist())
+    Returns:
+        int: Количество оставшихся строк
+    """
 
-    return matching_ids
+    rated_keys = ratings_ledger.get_rated(surname, username, affiliation)
+
+    return sum(
+        make_rated_key(csv_file, vacancy_id) not in rated_keys
+        for csv_file, df in zip(csv_files, vsa_dataframes)
+        for vacancy_id in df["ID"].iloc[:limit_per_file].tolist()
+    )
 
 
-def get_rows_to_evaluate(
+def get_evaluation_queue(
     csv_files: List[str],
-    ratings_files: List[str],
+    vsa_dataframes: List[pd.DataFrame],
+    ratings_ledger: RatingsLedger,
     limit_per_file: int,
     surname: str = None,
     username: str = None,
     affiliation: str = None,
-) -> List[Dict]:
+) -> List[List[str]]:
     """
-    Получение строк для оценки из файлов с исходными данными, которые еще не были оценены,
-    проверяя комбинации персональных данных и чередуя строки между файлами
+    Формирование очереди вакансий (файл, ID) для оценки пользователем в порядке чередования файлов
 
     Args:
         csv_files (List[str]): Список путей к CSV файлам с исходными данными
-        ratings_files (List[str]): Список путей к CSV файлам с оценками
+        vsa_dataframes (List[pd.DataFrame]): Загруженные DataFrame в порядке csv_files
+        ratings_ledger (RatingsLedger): Индекс уже выставленных оценок
         limit_per_file (int): Ограничение на количество строк для оценки из каждого файла
         surname (str): Значение фамилии (SURNAME) для поиска
         username (str): Значение имени (USERNAME) для поиска
         affiliation (str): Значение принадлежности (AFFILIATION) для поиска
 
     Returns:
-        List[Dict]: Список строк, которые нужно оценить, в виде словарей
+        List[List[str]]: Очередь пар [путь к файлу, ID]
     """
 
-    all_existing_ids = set()
+    rated_keys = ratings_ledger.get_rated(surname, username, affiliation)
 
-    # Собираем все ID, которые уже были оценены
-    for ratings_file in ratings_files:
-        all_existing_ids.update(
-            get_existing_ids(ratings_file, surname, username, affiliation)
+    return [
+        [str(csv_files[i]), str(vsa_dataframes[i]["ID"].iat[position])]
+        for i, position in _iter_pending_positions(
+            csv_files, vsa_dataframes, rated_keys, limit_per_file
         )
+    ]
+
 
-    # print(all_existing_ids)
+def pop_next_from_queue(
+    evaluation_queue: List[List[str]],
+    row_index: Dict[RatedKey, Tuple[int, int]],
+    ratings_ledger: RatingsLedger,
+    surname: str = None,
+    username: str = None,
+    affiliation: str = None,
+) -> Tuple[Optional[List[str]], List[List[str]]]:
+    """
+    Извлечение следующей вакансии из очереди пользователя. Вакансии, которые тем временем
+    были оценены в других сессиях этого же пользователя, пропускаются
 
-    all_dataframes = [read_csv_file(csv_file) for csv_file in csv_files]
+    Args:
+        evaluation_queue (List[List[str]]): Очередь пар [путь к файлу, ID]
+        row_index (Dict[RatedKey, Tuple[int, int]]): Индекс строк, построенный build_row_index
+        ratings_ledger (RatingsLedger): Индекс уже выставленных оценок
+        surname (str): Значение фамилии (SURNAME)
+        username (str): Значение имени (USERNAME)
+        affiliation (str): Значение принадлежности (AFFILIATION)
 
-    rows_to_evaluate = []
-    rows_added = [0] * len(csv_files)
+    Returns:
+        Tuple[Optional[List[str]], List[List[str]]]:
+            - Optional[List[str]]: Пара [путь к файлу, ID] или None, если очередь исчерпана
+            - List[List[str]]: Оставшаяся очередь
+    """
 
-    # Получаем ID пользователей с заданной комбинацией
-    matching_ids = get_user_ids_by_combination(
-        ratings_files, surname, username, affiliation
-    )
+    rated_keys = ratings_ledger.get_rated(surname, username, affiliation)
 
-    if not matching_ids:
-        all_existing_ids = set()
+    for n, queue_item in enumerate(evaluation_queue):
+        rated_key = make_rated_key(*queue_item)
 
-    # print(matching_ids)
+        if rated_key in rated_keys or rated_key not in row_index:
+            continue
 
-    while any(
-        rows_added[i] < min(limit_per_file, len(all_dataframes[i]))
-        for i in range(len(csv_files))
-    ):
-        for i, df in enumerate(all_dataframes):
-            if rows_added[i] >= min(limit_per_file, len(df)):
-                continue
+        return list(queue_item), evaluation_queue[n + 1 :]
+
+    return None, []
+
+
+def get_next_key_to_evaluate(
+    csv_files: List[str],
+    vsa_dataframes: List[pd.DataFrame],
+    ratings_ledger: RatingsLedger,
+    limit_per_file: int,
+    surname: str = None,
+    username: str = None,
+    affiliation: str = None,
+) -> Optional[List[str]]:
+    """
+    Получение пары [путь к файлу, ID] первой вакансии для оценки без построения строк
 
-            row = df.iloc[rows_added[i]]
+    Args:
+        csv_files (List[str]): Список путей к CSV файлам с исходными данными
+        vsa_dataframes (List[pd.DataFrame]): Загруженные DataFrame в порядке csv_files
+        ratings_ledger (RatingsLedger): Индекс уже выставленных оценок
+        limit_per_file (int): Ограничение на количество строк для оценки из каждого файла
+        surname (str): Значение фамилии (SURNAME) для поиска
+        username (str): Значение имени (USERNAME) для поиска
+        affiliation (str): Значение принадлежности (AFFILIATION) для поиска
 
-            # Проверяем, чтобы ID не было среди matching_ids или all_existing_ids
-            if row["ID"] not in matching_ids and row["ID"] not in all_existing_ids:
-                row_dict = row.to_dict()
-                row_dict["source_file"] = csv_files[i]
-                # print(row_dict["source_file"], row["ID"], row.get("Name", "No Name"))
-                rows_to_evaluate.append(row_dict)
+    Returns:
+        Optional[List[str]]: Пара [путь к файлу, ID] или None, если все строки оценены
+    """
+
+    rated_keys = ratings_ledger.get_rated(surname, username, affiliation)
 
-            rows_added[i] += 1
+    for i, position in _iter_pending_positions(
+        csv_files, vsa_dataframes, rated_keys, limit_per_file
+    ):
+        return [str(csv_files[i]), str(vsa_dataframes[i]["ID"].iat[position])]
 
-    return rows_to_evaluate
+    return None
@@ -0,0 +1,191 @@
+"""
+File: rating_writer.py
+Author: Dmitry Ryumin
+Description: Background writer that batches rating appends to the arena CSV files.
+License: MIT License
+"""
+
+import os
+import csv
+import queue
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:  # Без fcntl (Windows) файл дописывается без блокировки
+    fcntl = None
+
+# Importing necessary components for the Gradio app
+from app.metrics import stage_timer
+
+RATING_COLUMNS = ["ID", "SURNAME", "USERNAME", "AFFILIATION", "SBERT", "SBERT_LLM"]
+
+_STOP = object()
+
+
+class RatingWriter:
+    """
+    Единственный поток записи оценок с групповой фиксацией: обработчик ставит строку в очередь
+    и ожидает ее записи, а строки, поступившие, пока записывалась предыдущая пачка, дописываются
+    в CSV файлы следующей пачкой с одним fsync
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 100,
+        columns: Optional[List[str]] = None,
+        sep: str = ";",
+    ) -> None:
+        self.batch_size = max(1, int(batch_size))
+        self.columns = columns or RATING_COLUMNS
+        self.sep = sep
+
+        self._queue: queue.Queue = queue.Queue()
+        self._pending: Dict[Path, List[Tuple[List[Any], Future]]] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def start(self) -> None:
+        """
+        Запуск потока записи, если он еще не запущен
+        """
+
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+
+            self._thread = threading.Thread(
+                target=self._run, name="rating-writer", daemon=True
+            )
+            self._thread.start()
+
+    def submit(self, file_path: Union[str, Path], row: Dict[str, Any]) -> Future:
+        """
+        Постановка строки с оценкой в очередь на запись
+
+        Args:
+            file_path (Union[str, Path]): Путь к CSV файлу с оценками
+            row (Dict[str, Any]): Строка с оценкой, ключи соответствуют колонкам
+
+        Returns:
+            Future: Завершается после записи строки на диск или с ошибкой записи. Строка, Future
+            которой отменен до начала записи, не записывается
+        """
+
+        future: Future = Future()
+
+        self.start()
+        self._queue.put(
+            (Path(file_path), [row.get(col) for col in self.columns], future)
+        )
+
+        return future
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Ожидание записи всех строк, поставленных в очередь до вызова
+
+        Args:
+            timeout (Optional[float]): Максимальное время ожидания в секундах
+
+        Returns:
+            bool: True, если запись завершилась за отведенное время
+        """
+
+        if self._thread is None or not self._thread.is_alive():
+            return self._queue.empty() and not self._pending
+
+        done = threading.Event()
+        self._queue.put(done)
+
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        """
+        Запись оставшихся строк и остановка потока записи
+
+        Args:
+            timeout (Optional[float]): Максимальное время ожидания в секундах
+        """
+
+        if self._thread is None or not self._thread.is_alive():
+            return
+
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            items = [self._queue.get()]
+
+            # Пачку составляют строки, накопившиеся в очереди за время предыдущей записи
+            while len(items) < self.batch_size:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            events = []
+            stop = False
+
+            for item in items:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    events.append(item)
+                else:
+                    file_path, values, future = item
+
+                    # Обработчик, не дождавшийся записи, отменяет Future: такая строка пропускается
+                    if future.set_running_or_notify_cancel():
+                        self._pending.setdefault(file_path, []).append((values, future))
+
+            try:
+                self._flush_pending()
+            finally:
+                for event in events:
+                    event.set()
+
+            if stop:
+                return
+
+    def _flush_pending(self) -> None:
+        pending, self._pending = self._pending, {}
+
+        for file_path, entries in pending.items():
+            try:
+                with stage_timer("csv_append"):
+                    self._write_rows(file_path, [values for values, _ in entries])
+            except Exception as e:
+                # Ошибка передается обработчикам: оценки не учитываются и не подтверждаются, а поток
+                # записи продолжает работу со следующей пачкой
+                print(f"Ошибка записи оценок в {file_path}: {e}")
+
+                for _, future in entries:
+                    future.set_exception(e)
+                continue
+
+            for _, future in entries:
+                future.set_result(None)
+
+    def _write_rows(self, file_path: Path, rows: List[List[Any]]) -> None:
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(file_path, "a", encoding="utf-8-sig", newline="") as file:
+            # Файл могут дописывать несколько процессов: заголовок и пачка строк записываются
+            # под монопольной блокировкой, поэтому строки разных процессов не перемешиваются
+            if fcntl is not None:
+                fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+
+            writer = csv.writer(file, delimiter=self.sep, lineterminator="\n")
+
+            if file.seek(0, os.SEEK_END) == 0:
+                writer.writerow(self.columns)
+
+            writer.writerows(rows)
+
+            file.flush()
+            os.fsync(file.fileno())
@@ -0,0 +1,240 @@
+"""
+File: ratings_ledger.py
+Author: Dmitry Ryumin
+Description: In-memory index of the vacancies already rated by each user.
+License: MIT License
+"""
+
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import (
+    AbstractSet,
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+UserKey = Tuple[str, str, str]
+RatedKey = Tuple[str, str]
+
+
+def make_user_key(
+    surname: Optional[str], username: Optional[str], affiliation: Optional[str]
+) -> Optional[UserKey]:
+    """
+    Формирование ключа пользователя по комбинации фамилии, имени и принадлежности
+
+    Args:
+        surname (Optional[str]): Значение фамилии (SURNAME)
+        username (Optional[str]): Значение имени (USERNAME)
+        affiliation (Optional[str]): Значение принадлежности (AFFILIATION)
+
+    Returns:
+        Optional[UserKey]: Ключ пользователя или None, если персональные данные не заполнены
+    """
+
+    if not (surname and username and affiliation):
+        return None
+
+    return (str(surname), str(username), str(affiliation))
+
+
+def make_rated_key(
+    source_file: Union[str, Path], vacancy_id: Union[str, int]
+) -> RatedKey:
+    """
+    Формирование ключа оцененной вакансии: имя файла с группой вакансий и ID вакансии
+
+    Args:
+        source_file (Union[str, Path]): Путь к CSV файлу с исходными данными или с оценками
+        vacancy_id (Union[str, int]): ID вакансии
+
+    Returns:
+        RatedKey: Ключ вакансии
+    """
+
+    return (Path(source_file).name, str(vacancy_id))
+
+
+class RatedView(AbstractSet[RatedKey]):
+    """
+    Множество вакансий, оцененных пользователем, только для чтения. Проверка принадлежности
+    выполняется по множеству индекса без копирования, перебор - по снимку множества
+    """
+
+    def __init__(self, rated: Set[RatedKey], lock: threading.Lock) -> None:
+        self._rated = rated
+        self._lock = lock
+
+    def __contains__(self, rated_key: object) -> bool:
+        return rated_key in self._rated
+
+    def __len__(self) -> int:
+        return len(self._rated)
+
+    def __iter__(self) -> Iterator[RatedKey]:
+        with self._lock:
+            snapshot = list(self._rated)
+
+        return iter(snapshot)
+
+    @classmethod
+    def _from_iterable(cls, iterable: Iterable[RatedKey]) -> FrozenSet[RatedKey]:
+        # Операции над множествами (|, &, -) возвращают обычные неизменяемые множества
+        return frozenset(iterable)
+
+
+class RatingsLedger:
+    """
+    Индекс уже выставленных оценок: (фамилия, имя, принадлежность) -> {(файл, ID)}
+
+    Строится один раз при запуске приложения и дополняется при каждой новой оценке
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._rated: Dict[UserKey, Set[RatedKey]] = {}
+
+    def add_rows(
+        self, source_file: Union[str, Path], rows: Iterable[Dict[str, Any]]
+    ) -> List[Tuple[UserKey, RatedKey]]:
+        """
+        Добавление в индекс строк с оценками одного файла
+
+        Args:
+            source_file (Union[str, Path]): Путь к CSV файлу с исходными данными или с оценками
+            rows (Iterable[Dict[str, Any]]): Строки с колонками ID, SURNAME, USERNAME, AFFILIATION
+
+        Returns:
+            List[Tuple[UserKey, RatedKey]]: Новые оценки
+        """
+
+        user_columns = ("SURNAME", "USERNAME", "AFFILIATION")
+
+        return [
+            (
+                make_user_key(*(row.get(col) for col in user_columns)),
+                make_rated_key(source_file, row.get("ID")),
+            )
+            for row in rows
+            if self.add(
+                *(row.get(col) for col in user_columns), source_file, row.get("ID")
+            )
+        ]
+
+    def count_by_item(self) -> Counter:
+        """
+        Подсчет числа оценок каждой вакансии
+
+        Returns:
+            Counter: Ключ вакансии (имя файла, ID) -> число оценок
+        """
+
+        with self._lock:
+            return Counter(key for rated in self._rated.values() for key in rated)
+
+    def add(
+        self,
+        surname: str,
+        username: str,
+        affiliation: str,
+        source_file: Union[str, Path],
+        vacancy_id: Union[str, int],
+    ) -> bool:
+        """
+        Добавление оценки в индекс
+
+        Args:
+            surname (str): Значение фамилии (SURNAME)
+            username (str): Значение имени (USERNAME)
+            affiliation (str): Значение принадлежности (AFFILIATION)
+            source_file (Union[str, Path]): Путь к CSV файлу с исходными данными или с оценками
+            vacancy_id (Union[str, int]): ID оцененной вакансии
+
+        Returns:
+            bool: True, если пользователь ранее не оценивал эту вакансию
+        """
+
+        user_key = make_user_key(surname, username, affiliation)
+
+        if user_key is None:
+            return False
+
+        rated_key = make_rated_key(source_file, vacancy_id)
+
+        with self._lock:
+            rated = self._rated.setdefault(user_key, set())
+
+            if rated_key in rated:
+                return False
+
+            rated.add(rated_key)
+
+        return True
+
+    def get_rated(
+        self,
+        surname: Optional[str],
+        username: Optional[str],
+        affiliation: Optional[str],
+    ) -> AbstractSet[RatedKey]:
+        """
+        Получение всех вакансий, которые уже были оценены пользователем, без копирования
+
+        Args:
+            surname (Optional[str]): Значение фамилии (SURNAME)
+            username (Optional[str]): Значение имени (USERNAME)
+            affiliation (Optional[str]): Значение принадлежности (AFFILIATION)
+
+        Returns:
+            AbstractSet[RatedKey]: Множество ключей (имя файла, ID) оцененных вакансий,
+                которое отражает оценки, добавленные после вызова
+        """
+
+        user_key = make_user_key(surname, username, affiliation)
+
+        if user_key is None:
+            return frozenset()
+
+        with self._lock:
+            return RatedView(self._rated.setdefault(user_key, set()), self._lock)
+
+    def is_rated(
+        self,
+        surname: Optional[str],
+        username: Optional[str],
+        affiliation: Optional[str],
+        source_file: Union[str, Path],
+        vacancy_id: Union[str, int],
+    ) -> bool:
+        """
+        Проверка, оценивал ли пользователь вакансию
+
+        Args:
+            surname (Optional[str]): Значение фамилии (SURNAME)
+            username (Optional[str]): Значение имени (USERNAME)
+            affiliation (Optional[str]): Значение принадлежности (AFFILIATION)
+            source_file (Union[str, Path]): Путь к CSV файлу с исходными данными или с оценками
+            vacancy_id (Union[str, int]): ID вакансии
+
+        Returns:
+            bool: True, если вакансия уже оценена пользователем
+        """
+
+        user_key = make_user_key(surname, username, affiliation)
+
+        if user_key is None:
+            return False
+
+        with self._lock:
+            return make_rated_key(source_file, vacancy_id) in self._rated.get(
+                user_key, ()
+            )
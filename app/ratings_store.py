@@ -0,0 +1,386 @@
+"""
+File: ratings_store.py
+Author: Dmitry Ryumin
+Description: Storage backends for the arena ratings (CSV files or SQLite).
+License: MIT License
+"""
+
+import csv
+import sqlite3
+import argparse
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+# Importing necessary components for the Gradio app
+from app.config import config_data
+from app.rating_writer import RATING_COLUMNS, RatingWriter
+from app.utils import get_csv_files, read_csv_file
+
+
+class RatingsStoreError(Exception):
+    """
+    Ошибка записи оценки в хранилище оценок
+    """
+
+
+class RatingsStore(ABC):
+    """
+    Интерфейс хранилища оценок. Оценки группируются по имени CSV файла с исходными данными
+    """
+
+    @abstractmethod
+    def append(self, source_file: str, row: Dict[str, Any]) -> None:
+        """
+        Добавление оценки. Метод возвращает управление после записи оценки на диск
+
+        Args:
+            source_file (str): Имя CSV файла с исходными данными
+            row (Dict[str, Any]): Строка с оценкой, ключи соответствуют RATING_COLUMNS
+
+        Raises:
+            RatingsStoreError: Оценка не записана
+        """
+
+    @abstractmethod
+    def iter_ratings(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Перебор всех оценок
+
+        Yields:
+            Tuple[str, Dict[str, Any]]: Имя CSV файла с исходными данными и строка с оценкой
+        """
+
+    def get_position(self) -> int:
+        """
+        Позиция последней записанной оценки, после которой read_since читает новые оценки
+
+        Returns:
+            int: Позиция последней оценки
+        """
+
+        return 0
+
+    def read_since(self, position: int) -> Tuple[List[Tuple[str, Dict[str, Any]]], int]:
+        """
+        Чтение оценок, записанных после позиции position, в том числе другими процессами.
+        Хранилище в CSV файлах новых оценок не возвращает: дописанные строки читает DataWatcher
+
+        Args:
+            position (int): Позиция, полученная от get_position или от предыдущего вызова
+
+        Returns:
+            Tuple[List[Tuple[str, Dict[str, Any]]], int]:
+                - List[Tuple[str, Dict[str, Any]]]: Имена CSV файлов с исходными данными и строки с оценками
+                - int: Позиция последней прочитанной оценки
+        """
+
+        return [], position
+
+    def flush(self) -> None:
+        """
+        Запись всех оценок, принятых хранилищем, на диск
+        """
+
+    def close(self) -> None:
+        """
+        Завершение работы с хранилищем
+        """
+
+
+class CsvRatingsStore(RatingsStore):
+    """
+    Хранилище оценок в виде CSV файлов в директории StaticPaths.ARENA (один файл на группу вакансий)
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        writer: RatingWriter,
+        timeout: Optional[float] = None,
+    ) -> None:
+        self.directory = Path(directory)
+        self.writer = writer
+        self.timeout = timeout
+
+    def get_file_path(self, source_file: str) -> Path:
+        return self.directory / Path(source_file).name
+
+    def append(self, source_file: str, row: Dict[str, Any]) -> None:
+        future = self.writer.submit(self.get_file_path(source_file), row)
+
+        try:
+            future.result(self.timeout)
+        except FutureTimeoutError as e:
+            # Строка, запись которой еще не началась, снимается с очереди. Если запись уже идет,
+            # обработчик дожидается ее результата еще один интервал timeout
+            if future.cancel():
+                raise RatingsStoreError("Истекло время ожидания записи оценки") from e
+
+            try:
+                future.result(self.timeout)
+            except FutureTimeoutError as e:
+                raise RatingsStoreError("Истекло время ожидания записи оценки") from e
+            except Exception as e:
+                raise RatingsStoreError(str(e)) from e
+        except Exception as e:
+            raise RatingsStoreError(str(e)) from e
+
+    def iter_ratings(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        for ratings_file in get_csv_files(self.directory):
+            try:
+                df = read_csv_file(ratings_file)
+            except FileNotFoundError:
+                continue
+
+            for row in df.to_dict(orient="records"):
+                yield ratings_file.name, row
+
+    def flush(self) -> None:
+        self.writer.flush()
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class SqliteRatingsStore(RatingsStore):
+    """
+    Хранилище оценок в базе SQLite в режиме WAL с индексами по пользователю и по вакансии
+    """
+
+    def __init__(self, db_path: Union[str, Path]) -> None:
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._local = threading.local()
+        # Соединения всех потоков: при закрытии хранилища (в том числе перед fork)
+        # закрываются все соединения, а не только соединение вызывающего потока
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+
+        with self._connection() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS ratings (
+                    source_file TEXT NOT NULL,
+                    ID TEXT NOT NULL,
+                    SURNAME TEXT NOT NULL,
+                    USERNAME TEXT NOT NULL,
+                    AFFILIATION TEXT NOT NULL,
+                    SBERT INTEGER,
+                    SBERT_LLM INTEGER
+                );
+                CREATE INDEX IF NOT EXISTS ratings_user
+                    ON ratings (SURNAME, USERNAME, AFFILIATION);
+                CREATE INDEX IF NOT EXISTS ratings_vacancy
+                    ON ratings (source_file, ID);
+                """)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+
+        with self._connections_lock:
+            if conn is not None and conn in self._connections:
+                return conn
+
+            # Соединение используется только своим потоком, но закрывается из любого
+            conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._connections.append(conn)
+
+        self._local.conn = conn
+
+        return conn
+
+    @staticmethod
+    def _values(source_file: str, row: Dict[str, Any]) -> Tuple:
+        return (Path(source_file).name,) + tuple(
+            str(row.get(col)) if col == "ID" else row.get(col) for col in RATING_COLUMNS
+        )
+
+    def append(self, source_file: str, row: Dict[str, Any]) -> None:
+        try:
+            self._insert(source_file, row)
+        except sqlite3.Error as e:
+            raise RatingsStoreError(str(e)) from e
+
+    def _insert(self, source_file: str, row: Dict[str, Any]) -> None:
+        with self._connection() as conn:
+            conn.execute(
+                f"INSERT INTO ratings (source_file, {', '.join(RATING_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * (len(RATING_COLUMNS) + 1))})",
+                self._values(source_file, row),
+            )
+
+    def replace_source_file(self, source_file: str, rows: List[Dict[str, Any]]) -> None:
+        """
+        Замена всех оценок одного файла в одной транзакции (используется при импорте)
+
+        Args:
+            source_file (str): Имя CSV файла с исходными данными
+            rows (List[Dict[str, Any]]): Строки с оценками
+        """
+
+        with self._connection() as conn:
+            conn.execute(
+                "DELETE FROM ratings WHERE source_file = ?", (Path(source_file).name,)
+            )
+            conn.executemany(
+                f"INSERT INTO ratings (source_file, {', '.join(RATING_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * (len(RATING_COLUMNS) + 1))})",
+                [self._values(source_file, row) for row in rows],
+            )
+
+    def iter_ratings(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        cursor = self._connection().execute(
+            f"SELECT source_file, {', '.join(RATING_COLUMNS)} FROM ratings ORDER BY rowid"
+        )
+
+        for source_file, *values in cursor:
+            yield source_file, dict(zip(RATING_COLUMNS, values))
+
+    def get_position(self) -> int:
+        (position,) = (
+            self._connection()
+            .execute("SELECT COALESCE(MAX(rowid), 0) FROM ratings")
+            .fetchone()
+        )
+
+        return position
+
+    def read_since(self, position: int) -> Tuple[List[Tuple[str, Dict[str, Any]]], int]:
+        rows = []
+
+        for rowid, source_file, *values in self._connection().execute(
+            f"SELECT rowid, source_file, {', '.join(RATING_COLUMNS)} FROM ratings "
+            "WHERE rowid > ? ORDER BY rowid",
+            (position,),
+        ):
+            rows.append((source_file, dict(zip(RATING_COLUMNS, values))))
+            position = rowid
+
+        return rows, position
+
+    def close(self) -> None:
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+
+        for conn in connections:
+            conn.close()
+
+
+def create_ratings_store(config: Any = config_data) -> RatingsStore:
+    """
+    Создание хранилища оценок согласно настройке RatingsStore.BACKEND
+
+    Args:
+        config (Any): Объект конфигурации
+
+    Returns:
+        RatingsStore: Хранилище оценок
+    """
+
+    backend = config.RatingsStore_BACKEND
+
+    if backend == "csv":
+        writer = RatingWriter(batch_size=config.RatingWriter_BATCH_SIZE)
+        writer.start()
+
+        return CsvRatingsStore(
+            config.StaticPaths_ARENA, writer, timeout=config.RatingWriter_TIMEOUT
+        )
+
+    if backend == "sqlite":
+        return SqliteRatingsStore(config.RatingsStore_SQLITE_PATH)
+
+    raise ValueError(f"Неизвестное хранилище оценок: {backend}")
+
+
+def import_csv_files(
+    store: SqliteRatingsStore, ratings_files: List[Union[str, Path]]
+) -> int:
+    """
+    Однократный импорт CSV файлов с оценками в базу SQLite
+
+    Args:
+        store (SqliteRatingsStore): Хранилище оценок SQLite
+        ratings_files (List[Union[str, Path]]): Список путей к CSV файлам с оценками
+
+    Returns:
+        int: Количество импортированных оценок
+    """
+
+    total = 0
+
+    for ratings_file in ratings_files:
+        rows = read_csv_file(ratings_file).to_dict(orient="records")
+        store.replace_source_file(Path(ratings_file).name, rows)
+        total += len(rows)
+
+    return total
+
+
+def export_csv_files(store: RatingsStore, output_dir: Union[str, Path]) -> int:
+    """
+    Выгрузка оценок в CSV файлы в привычном формате (один файл на группу вакансий)
+
+    Args:
+        store (RatingsStore): Хранилище оценок
+        output_dir (Union[str, Path]): Директория для CSV файлов
+
+    Returns:
+        int: Количество выгруженных оценок
+    """
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    rows_by_file: Dict[str, List[List[Any]]] = {}
+
+    for source_file, row in store.iter_ratings():
+        rows_by_file.setdefault(source_file, []).append(
+            [row.get(col) for col in RATING_COLUMNS]
+        )
+
+    for source_file, rows in rows_by_file.items():
+        with open(
+            output_dir / source_file, "w", encoding="utf-8-sig", newline=""
+        ) as file:
+            writer = csv.writer(file, delimiter=";", lineterminator="\n")
+            writer.writerow(RATING_COLUMNS)
+            writer.writerows(rows)
+
+    return sum(len(rows) for rows in rows_by_file.values())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Импорт оценок из CSV в SQLite и выгрузка оценок в CSV"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser("import", help="CSV -> SQLite")
+    import_parser.add_argument("--arena-dir", default=config_data.StaticPaths_ARENA)
+    import_parser.add_argument(
+        "--sqlite-path", default=config_data.RatingsStore_SQLITE_PATH
+    )
+
+    export_parser = subparsers.add_parser("export", help="SQLite -> CSV")
+    export_parser.add_argument("--output-dir", required=True)
+    export_parser.add_argument(
+        "--sqlite-path", default=config_data.RatingsStore_SQLITE_PATH
+    )
+
+    args = parser.parse_args()
+    sqlite_store = SqliteRatingsStore(args.sqlite_path)
+
+    if args.command == "import":
+        count = import_csv_files(sqlite_store, get_csv_files(args.arena_dir))
+        print(f"Импортировано оценок: {count}")
+    else:
+        count = export_csv_files(sqlite_store, args.output_dir)
+        print(f"Выгружено оценок: {count}")
+
+    sqlite_store.close()
@@ -0,0 +1,170 @@
+"""
+File: render_cache.py
+Author: Dmitry Ryumin
+Description: Bounded LRU cache of prepared vacancy render payloads.
+License: MIT License
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+# Importing necessary components for the Gradio app
+from app.vacancy_records import VacancyRecord
+
+
+def get_subjects_catalog_version(unique_subjects: set) -> str:
+    """
+    Вычисление версии справочника дисциплин для ключей кэша
+
+    Args:
+        unique_subjects (set): Множество уникальных названий дисциплин в нижнем регистре
+
+    Returns:
+        str: Версия справочника
+    """
+
+    digest = hashlib.sha1("\n".join(sorted(unique_subjects)).encode("utf-8"))
+
+    return digest.hexdigest()[:16]
+
+
+def parse_key_skills(key_skills: Any) -> Optional[List[str]]:
+    """
+    Разбор строки с ключевыми навыками, разделенными запятыми
+
+    Args:
+        key_skills (Any): Значение колонки KeySkills (строка или NaN, если навыки не указаны)
+
+    Returns:
+        Optional[List[str]]: Список ключевых навыков или None, если навыки не указаны
+    """
+
+    if not isinstance(key_skills, str):
+        return None
+
+    return [item.strip() for item in key_skills.split(",") if item.strip()]
+
+
+def prepare_vacancy_payload(
+    record: VacancyRecord,
+    dataframe_a: List[List[str]],
+    dataframe_b: List[List[str]],
+) -> Dict[str, Any]:
+    """
+    Подготовка всех данных, необходимых для отображения вакансии
+
+    Args:
+        record (VacancyRecord): Запись вакансии
+        dataframe_a (List[List[str]]): Курсы системы А, см. get_vacancy_courses
+        dataframe_b (List[List[str]]): Курсы системы Б, см. get_vacancy_courses
+
+    Returns:
+        Dict[str, Any]: Данные вакансии для отображения
+    """
+
+    return {
+        "source_file": record.source_file,
+        "ID": record.id,
+        "Name": record.name,
+        "Description": record.description,
+        "key_skills": parse_key_skills(record.key_skills),
+        "dataframe_a": dataframe_a,
+        "dataframe_b": dataframe_b,
+    }
+
+
+class RenderCache:
+    """
+    Ограниченный LRU кэш подготовленных данных вакансий со счетчиками попаданий и промахов.
+    Если данные по ключу уже готовятся в другом потоке (например, при упреждающей подготовке),
+    повторный запрос ожидает их вместо повторной подготовки
+    """
+
+    def __init__(self, max_size: int = 1024) -> None:
+        self.max_size = max(0, int(max_size))
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._items: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+        self._pending: Dict[Hashable, threading.Event] = {}
+
+    def get_or_create(
+        self, key: Hashable, factory: Callable[[], Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Получение данных из кэша или их подготовка при промахе
+
+        Args:
+            key (Hashable): Ключ (файл, ID вакансии, версия справочника дисциплин)
+            factory (Callable[[], Dict[str, Any]]): Функция подготовки данных
+
+        Returns:
+            Dict[str, Any]: Подготовленные данные вакансии
+        """
+
+        while True:
+            with self._lock:
+                payload = self._items.get(key)
+
+                if payload is not None:
+                    self._items.move_to_end(key)
+                    self.hits += 1
+                    return payload
+
+                pending = self._pending.get(key)
+
+                if pending is None:
+                    self.misses += 1
+
+                    if self.max_size:
+                        pending = self._pending[key] = threading.Event()
+
+                    break
+
+            # Если подготовка в другом потоке завершилась ошибкой, данные готовятся заново
+            pending.wait()
+
+        try:
+            payload = factory()
+
+            if self.max_size:
+                with self._lock:
+                    self._items[key] = payload
+                    self._items.move_to_end(key)
+
+                    while len(self._items) > self.max_size:
+                        self._items.popitem(last=False)
+        finally:
+            if pending is not None:
+                with self._lock:
+                    del self._pending[key]
+                pending.set()
+
+        return payload
+
+    def clear(self) -> None:
+        """
+        Очистка кэша
+        """
+
+        with self._lock:
+            self._items.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Получение статистики кэша
+
+        Returns:
+            Dict[str, int]: Количество попаданий, промахов и элементов в кэше
+        """
+
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._items),
+                "max_size": self.max_size,
+            }
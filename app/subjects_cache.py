@@ -0,0 +1,116 @@
+"""
+File: subjects_cache.py
+Author: Dmitry Ryumin
+Description: Cached loading of the normalised subjects catalog from Excel workbooks.
+License: MIT License
+"""
+
+import json
+import hashlib
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+# Importing necessary components for the Gradio app
+from app.utils import read_excel_files
+from app.vsa_cache import write_atomic
+
+CACHE_NAME = "subjects.json"
+
+
+def get_file_checksum(file_path: Union[str, Path], chunk_size: int = 1 << 20) -> str:
+    """
+    Вычисление контрольной суммы файла
+
+    Args:
+        file_path (Union[str, Path]): Путь к файлу
+        chunk_size (int): Размер читаемого блока в байтах
+
+    Returns:
+        str: Контрольная сумма SHA-1
+    """
+
+    digest = hashlib.sha1()
+
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def load_unique_subjects(
+    directory: Union[str, Path],
+    column: str,
+    cache_dir: Union[str, Path],
+    ext: str = "*.xlsx",
+    max_workers: Optional[int] = None,
+    changed: Optional[Iterable[str]] = None,
+) -> set:
+    """
+    Загрузка множества уникальных названий дисциплин в нижнем регистре.
+    Дисциплины кэшируются по каждому Excel файлу: разбираются только новые и измененные файлы
+
+    Args:
+        directory (Union[str, Path]): Путь к директории, содержащей Excel файлы
+        column (str): Колонка с названием дисциплины
+        cache_dir (Union[str, Path]): Директория кэша
+        ext (str): Расширение файлов для поиска. По умолчанию "*.xlsx"
+        max_workers (Optional[int]): Количество процессов для чтения Excel файлов
+        changed (Optional[Iterable[str]]): Измененные файлы, о которых сообщил DataWatcher.
+            Контрольные суммы остальных файлов берутся из кэша. По умолчанию проверяются все файлы
+
+    Returns:
+        set: Множество уникальных названий дисциплин
+    """
+
+    cache_path = Path(cache_dir) / CACHE_NAME
+
+    try:
+        with open(cache_path, "r", encoding="utf-8") as file:
+            cache = json.load(file)
+
+        cached_files = cache["files"] if cache.get("column") == column else {}
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        cached_files = {}
+
+    workbooks = [str(file) for file in sorted(Path(directory).rglob(ext))]
+    changed = None if changed is None else {str(path) for path in changed}
+
+    files = {}
+    to_parse = {}
+
+    for workbook in workbooks:
+        entry = cached_files.get(workbook)
+
+        if changed is not None and workbook not in changed and entry is not None:
+            files[workbook] = entry
+            continue
+
+        checksum = get_file_checksum(workbook)
+
+        if entry is not None and entry["checksum"] == checksum:
+            files[workbook] = entry
+        else:
+            to_parse[workbook] = checksum
+
+    frames = read_excel_files(list(to_parse), max_workers)
+
+    for (workbook, checksum), frame in zip(to_parse.items(), frames):
+        subjects = (
+            frame[column].dropna().astype(str).str.lower().unique().tolist()
+            if column in frame.columns
+            else []
+        )
+        files[workbook] = {"checksum": checksum, "subjects": sorted(subjects)}
+
+    if files != cached_files:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(
+            cache_path,
+            lambda path: path.write_text(
+                json.dumps({"column": column, "files": files}, ensure_ascii=False),
+                "utf-8",
+            ),
+        )
+
+    return {subject for entry in files.values() for subject in entry["subjects"]}
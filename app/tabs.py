@@ -21,13 +21,6 @@ from app.components import (
     button,
     html_message,
 )
-from app.data_init import (
-    first_vsa_row,
-    headers_a,
-    headers_b,
-    parsed_first_dataframe_a,
-    parsed_first_dataframe_b,
-)
 
 
 def app_tab():
@@ -128,7 +121,7 @@ def app_tab():
             )
 
             csv_vsa_file = textbox_create_ui(
-                value=first_vsa_row["source_file"],
+                value=None,
                 type="text",
                 label=None,
                 placeholder=None,
@@ -143,7 +136,7 @@ def app_tab():
             )
 
             vacancy_id = textbox_create_ui(
-                value=first_vsa_row["ID"],
+                value=None,
                 type="text",
                 label=None,
                 placeholder=None,
@@ -158,7 +151,7 @@ def app_tab():
             )
 
             vacancy_name = textbox_create_ui(
-                value=first_vsa_row["Name"],
+                value=None,
                 type="text",
                 label=None,
                 placeholder=None,
@@ -186,6 +179,7 @@ def app_tab():
                 choices=None,
                 value=None,
                 multiselect=True,
+                interactive=False,
                 visible=False,
                 elem_classes="dropdown-keyskills",
             )
@@ -204,8 +198,8 @@ def app_tab():
     ) as rating_row:
         with gr.Column(scale=1, visible=True, render=True):
             res_a = dataframe(
-                headers=headers_a,
-                values=parsed_first_dataframe_a,
+                headers=config_data.DataframeHeaders_RESULT,
+                values=None,
                 label=config_data.Labels_RESULT_A,
                 show_label=True,
                 visible=True,
@@ -222,8 +216,8 @@ def app_tab():
 
         with gr.Column(scale=1, visible=True, render=True):
             res_b = dataframe(
-                headers=headers_b,
-                values=parsed_first_dataframe_b,
+                headers=[config_data.DataframeHeaders_RESULT[0]],
+                values=None,
                 label=config_data.Labels_RESULT_B,
                 show_label=True,
                 visible=True,
@@ -244,7 +238,7 @@ def app_tab():
         scale=1,
         icon=config_data.StaticPaths_IMAGES + "calculate_rating.ico",
         visible=False,
-        elem_classes=None,
+        elem_classes="calculate_rating",
     )
 
     notifications_calculate = html_message(
@@ -253,6 +247,8 @@ def app_tab():
         visible=False,
     )
 
+    evaluation_queue = gr.State(value=[])
+
     return (
         surname,
         username,
@@ -274,6 +270,7 @@ def app_tab():
         dropdown_rating_b,
         calculate_rating,
         notifications_calculate,
+        evaluation_queue,
     )
 
 
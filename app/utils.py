@@ -5,14 +5,134 @@ Description: Utility functions.
 License: MIT License
 """
 
+import os
 import re
 import random
+import threading
+import multiprocessing
 import pandas as pd
 from typing import List, Tuple, Any, Dict, Union, Optional
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 
 # Importing necessary components for the Gradio app
 
+# Обертка для названий дисциплин, которых нет в справочнике
+SUBJECT_WRAPPER = "<span class='wrapper_subject'><span class='err'>{}</span></span>"
+
+# Суммарный размер Excel файлов, начиная с которого они читаются в отдельных процессах. Процесс,
+# запущенный через spawn, заново импортирует главный модуль приложения (gradio и интерфейс), что
+# занимает секунды, а openpyxl разбирает около 0.25 МБ xlsx в секунду: небольшие справочники
+# быстрее прочитать в текущем процессе
+PARALLEL_EXCEL_MIN_BYTES = 4 << 20
+
+# Классификация имен файлов: 1 для английских, 2 для русских, 3 для цифр, 4 для остальных
+FILE_NAME_CLASSES = [
+    (re.compile(r"[A-Za-z]"), 1),
+    (re.compile(r"[А-Яа-яЁё]"), 2),
+    (re.compile(r"\d"), 3),
+]
+
+
+def file_sort_key(file_name: Path) -> tuple:
+    """
+    Ключ сортировки файлов: сначала английские имена, затем русские, затем цифры
+
+    Args:
+        file_name (Path): Путь к файлу
+
+    Returns:
+        tuple: Класс имени файла и имя файла без расширения
+    """
+
+    name = file_name.stem
+
+    for pattern, name_class in FILE_NAME_CLASSES:
+        if pattern.match(name):
+            return (name_class, name)
+
+    return (4, name)
+
+
+class DirectoryListingCache:
+    """
+    Кэш отсортированных списков файлов. Список формируется заново только после изменения
+    времени модификации одной из просмотренных директорий или после вызова invalidate
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._listings: Dict[Tuple[str, str], Tuple[Dict[str, int], List[Path]]] = {}
+
+    @staticmethod
+    def _directory_mtimes(directories: List[str]) -> Optional[Dict[str, int]]:
+        try:
+            return {
+                directory: os.stat(directory).st_mtime_ns for directory in directories
+            }
+        except FileNotFoundError:
+            return None
+
+    def get(self, directory: Union[str, Path], ext: str) -> List[Path]:
+        """
+        Получение отсортированного списка файлов директории (включая вложенные директории)
+
+        Args:
+            directory (Union[str, Path]): Путь к директории
+            ext (str): Расширение файлов для поиска
+
+        Returns:
+            List[Path]: Список путей к файлам
+        """
+
+        key = (str(directory), ext)
+
+        with self._lock:
+            cached = self._listings.get(key)
+
+        if cached is not None:
+            mtimes, files = cached
+
+            if self._directory_mtimes(list(mtimes)) == mtimes:
+                return list(files)
+
+        path_to_files = Path(directory)
+        directories = [str(path_to_files)] + [
+            str(path) for path in path_to_files.rglob("*") if path.is_dir()
+        ]
+
+        # Время модификации фиксируется до чтения списка, чтобы не пропустить изменения во время чтения
+        mtimes = self._directory_mtimes(directories)
+        files = sorted(path_to_files.rglob(ext), key=file_sort_key)
+
+        with self._lock:
+            if mtimes is not None:
+                self._listings[key] = (mtimes, files)
+            else:
+                self._listings.pop(key, None)
+
+        return list(files)
+
+    def invalidate(self, directory: Optional[Union[str, Path]] = None) -> None:
+        """
+        Сброс кэша для директории или для всех директорий
+
+        Args:
+            directory (Optional[Union[str, Path]]): Путь к директории. По умолчанию - все директории
+        """
+
+        with self._lock:
+            if directory is None:
+                self._listings.clear()
+                return
+
+            for key in [key for key in self._listings if key[0] == str(directory)]:
+                del self._listings[key]
+
+
+# Общий для всего приложения кэш списков файлов
+directory_listing_cache = DirectoryListingCache()
+
 
 def get_csv_files(directory: Union[str, Path], ext: str = "*.csv") -> List[Path]:
     """
@@ -26,30 +146,14 @@ def get_csv_files(directory: Union[str, Path], ext: str = "*.csv") -> List[Path]
         List[Path]: Список путей к CSV файлам
     """
 
-    def custom_sort_key(file_name: Path) -> tuple:
-        name = file_name.stem
-
-        # Классификация: 1 для английских, 2 для русских, 3 для цифр
-        if re.match(r"^[A-Za-z]", name):  # Английские буквы
-            return (1, name)
-        elif re.match(r"^[А-Яа-яЁё]", name):  # Русские буквы
-            return (2, name)
-        elif re.match(r"^\d", name):  # Цифры
-            return (3, name)
-        else:
-            return (4, name)  # Все остальные символы
-
-    path_to_files = Path(directory)
-    csv_files = list(path_to_files.rglob(ext))
-
-    # Сортировка по кастомному ключу
-    sorted_csv_files = sorted(csv_files, key=custom_sort_key)
-
-    return sorted_csv_files
+    return directory_listing_cache.get(directory, ext)
 
 
 def read_csv_file(
-    file_path: Union[str, Path], sep: str = ";", drop_columns: List[str] = []
+    file_path: Union[str, Path],
+    sep: str = ";",
+    drop_columns: List[str] = [],
+    nrows: Optional[int] = None,
 ) -> pd.DataFrame:
     """
     Чтение CSV файла и возвращение предварительно обработанный DataFrame
@@ -58,12 +162,14 @@ def read_csv_file(
         file_path (Union[str, Path]): Путь к файлу CSV
         sep (str, optional): Разделитель в CSV файле. По умолчанию ";"
         drop_columns (List[str], optional): Список колонок для удаления
+        nrows (Optional[int], optional): Количество первых строк для чтения. Остальная часть
+            файла не разбирается. По умолчанию читается весь файл
 
     Returns:
         pd.DataFrame: Обработанный DataFrame с индексом
     """
 
-    df = pd.read_csv(file_path, encoding="utf-8-sig", sep=sep)
+    df = pd.read_csv(file_path, encoding="utf-8-sig", sep=sep, nrows=nrows)
 
     if drop_columns:
         df = pd.DataFrame(df.drop(drop_columns, axis=1))
@@ -174,28 +280,66 @@ def randomize_results(
     return parsed_first_dataframe_a, headers_a, parsed_first_dataframe_b, headers_b
 
 
-def load_excel_files(directory: str, ext: str = "*.xlsx") -> pd.DataFrame:
+def read_excel_files(
+    files: List[Union[str, Path]],
+    max_workers: Optional[int] = None,
+    min_parallel_bytes: int = PARALLEL_EXCEL_MIN_BYTES,
+) -> List[pd.DataFrame]:
     """
-    Загрузка и объединение всех Excel файлов из указанной директории в один DataFrame
+    Чтение Excel файлов. Файлы суммарным размером от min_parallel_bytes читаются параллельно
+    в отдельных процессах, но не более чем по числу ядер
+
+    Args:
+        files (List[Union[str, Path]]): Пути к Excel файлам
+        max_workers (Optional[int]): Количество процессов. По умолчанию - по числу ядер
+        min_parallel_bytes (int): Наименьший суммарный размер файлов для чтения в процессах
+
+    Returns:
+        List[pd.DataFrame]: DataFrame в порядке files
+    """
+
+    if not files:
+        return []
+
+    cpu_count = os.cpu_count() or 1
+    max_workers = min(len(files), max_workers or cpu_count, cpu_count)
+
+    if (
+        max_workers == 1
+        or sum(os.path.getsize(file) for file in files) < min_parallel_bytes
+    ):
+        return [pd.read_excel(file) for file in files]
+
+    # Процессы запускаются через spawn: fork процесса с работающими потоками сервера,
+    # записи оценок и наблюдения за файлами может зависнуть на их блокировках
+    with ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        return list(executor.map(pd.read_excel, files))
+
+
+def load_excel_files(
+    directory: str, ext: str = "*.xlsx", max_workers: Optional[int] = None
+) -> pd.DataFrame:
+    """
+    Загрузка и объединение всех Excel файлов из указанной директории в один DataFrame.
+    Файлы читаются read_excel_files и объединяются одним pd.concat
 
     Args:
         directory (str): Путь к директории, содержащей Excel файлы
         ext (str): Расширение файлов для поиска. По умолчанию "*.xlsx"
+        max_workers (Optional[int]): Количество процессов. По умолчанию - по числу ядер
 
     Returns:
         pd.DataFrame: DataFrame, содержащий данные из всех Excel файлов
     """
 
-    path_to_files = Path(directory)
-    xlsx_files = list(path_to_files.rglob(ext))
-
-    df = pd.DataFrame()
+    frames = read_excel_files(sorted(Path(directory).rglob(ext)), max_workers)
 
-    for file in xlsx_files:
-        df_temp = pd.read_excel(file)
-        df = pd.concat([df, df_temp], ignore_index=True)
+    if not frames:
+        return pd.DataFrame()
 
-    return df
+    return pd.concat(frames, ignore_index=True)
 
 
 def wrap_subjects(
@@ -215,7 +359,7 @@ def wrap_subjects(
 
     def wrap_course_name(course_name: str) -> str:
         if course_name.lower() not in unique_subjects:
-            return f"<span class='wrapper_subject'><span class='err'>{course_name}</span></span>"
+            return SUBJECT_WRAPPER.format(course_name)
         return course_name
 
     wrapped_data = [
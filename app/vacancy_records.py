@@ -0,0 +1,82 @@
+"""
+File: vacancy_records.py
+Author: Dmitry Ryumin
+Description: Compact typed records of the vacancies from the source CSV files.
+License: MIT License
+"""
+
+import pandas as pd
+from pathlib import Path
+from typing import Any, List, NamedTuple, Optional, Union
+
+# Importing necessary components for the Gradio app
+from app.course_table import SYSTEM_COLUMNS
+
+
+class VacancyRecord(NamedTuple):
+    """
+    Вакансия из файла с исходными данными
+    """
+
+    source_file: str
+    id: str
+    name: str
+    description: str
+    key_skills: Optional[str]
+    courses_a: str
+    courses_b: str
+
+
+def _column(df: pd.DataFrame, name: Union[str, int]) -> List[Any]:
+    if isinstance(name, int):
+        if name >= len(df.columns):
+            return [None] * len(df)
+        name = df.columns[name]
+
+    if name not in df.columns:
+        return [None] * len(df)
+
+    return df[name].tolist()
+
+
+def _text(value: Any) -> Optional[str]:
+    # Пустые ячейки pandas читает как NaN
+    return value if isinstance(value, str) else None
+
+
+def build_vacancy_records(
+    csv_file: Union[str, Path], df: pd.DataFrame
+) -> List[VacancyRecord]:
+    """
+    Построение записей всех вакансий файла в порядке строк DataFrame. Колонки извлекаются
+    целиком, без построения строк pandas
+
+    Args:
+        csv_file (Union[str, Path]): Путь к CSV файлу с исходными данными
+        df (pd.DataFrame): Загруженный DataFrame файла
+
+    Returns:
+        List[VacancyRecord]: Записи вакансий
+    """
+
+    source_file = str(csv_file)
+
+    return [
+        VacancyRecord(
+            source_file,
+            str(vacancy_id),
+            _text(name) or "",
+            _text(description) or "",
+            _text(key_skills),
+            _text(courses_a) or "",
+            _text(courses_b) or "",
+        )
+        for vacancy_id, name, description, key_skills, courses_a, courses_b in zip(
+            _column(df, "ID"),
+            _column(df, "Name"),
+            _column(df, "Description"),
+            _column(df, "KeySkills"),
+            _column(df, SYSTEM_COLUMNS["A"][0]),
+            _column(df, SYSTEM_COLUMNS["B"][0]),
+        )
+    ]
@@ -0,0 +1,248 @@
+"""
+File: vacancy_store.py
+Author: Dmitry Ryumin
+Description: Read-only memory-mapped store of the vacancy records shared between processes.
+License: MIT License
+"""
+
+import mmap
+import struct
+import hashlib
+import pandas as pd
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Union
+
+# Importing necessary components for the Gradio app
+from app.vacancy_records import VacancyRecord, build_vacancy_records
+from app.vsa_cache import get_file_signature, write_atomic
+
+MAGIC = b"VST2"
+
+# Заголовок: метка, размер и время изменения CSV файла, количество прочитанных строк
+# (-1 - файл прочитан целиком), количество записей
+HEADER = struct.Struct("<4sQqqI")
+
+# Поля записи, которые хранятся в таблице строк (путь к файлу задается при открытии)
+FIELDS = ("id", "name", "description", "key_skills", "courses_a", "courses_b")
+
+# Запись фиксированной ширины: смещение и длина строки каждого поля
+ENTRY = struct.Struct("<" + "QI" * len(FIELDS))
+
+# Длина поля, значение которого отсутствует (None)
+NO_VALUE = 0xFFFFFFFF
+
+
+def get_store_file_name(csv_file: Union[str, Path]) -> str:
+    """
+    Получение имени файла хранилища для CSV файла с исходными данными
+
+    Args:
+        csv_file (Union[str, Path]): Путь к CSV файлу
+
+    Returns:
+        str: Имя файла хранилища
+    """
+
+    digest = hashlib.sha1(str(Path(csv_file).resolve()).encode("utf-8")).hexdigest()
+
+    return f"{Path(csv_file).stem}.{digest[:16]}.vst"
+
+
+def write_vacancy_store(
+    store_path: Union[str, Path],
+    csv_file: Union[str, Path],
+    records: List[VacancyRecord],
+    nrows: Optional[int] = None,
+) -> None:
+    """
+    Запись хранилища: заголовок, записи фиксированной ширины в порядке строк файла
+    и таблица строк UTF-8
+
+    Args:
+        store_path (Union[str, Path]): Путь к файлу хранилища
+        csv_file (Union[str, Path]): Путь к CSV файлу, из которого построены записи
+        records (List[VacancyRecord]): Записи вакансий в порядке строк файла
+        nrows (Optional[int]): Количество прочитанных первых строк CSV файла
+    """
+
+    signature = get_file_signature(csv_file)
+    strings = bytearray()
+    entries = bytearray()
+
+    for record in records:
+        values = []
+
+        for field in FIELDS:
+            value = getattr(record, field)
+
+            if value is None:
+                values += [0, NO_VALUE]
+                continue
+
+            encoded = value.encode("utf-8")
+            values += [len(strings), len(encoded)]
+            strings += encoded
+
+        entries += ENTRY.pack(*values)
+
+    def write(path: Path) -> None:
+        with open(path, "wb") as file:
+            file.write(
+                HEADER.pack(
+                    MAGIC,
+                    signature["size"],
+                    signature["mtime_ns"],
+                    -1 if nrows is None else nrows,
+                    len(records),
+                )
+            )
+            file.write(entries)
+            file.write(strings)
+
+    write_atomic(Path(store_path), write)
+
+
+class MappedVacancyRecords(Sequence[VacancyRecord]):
+    """
+    Записи вакансий одного файла, отображенные в память только для чтения. Страницы файла
+    разделяются всеми процессами, которые его открыли; строки декодируются только при обращении
+    к записи
+    """
+
+    def __init__(
+        self, store_path: Union[str, Path], source_file: Union[str, Path]
+    ) -> None:
+        self.store_path = Path(store_path)
+        self.source_file = str(source_file)
+
+        with open(self.store_path, "rb") as file:
+            self._mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, size, mtime_ns, nrows, count = HEADER.unpack_from(self._mm, 0)
+
+        if magic != MAGIC:
+            raise ValueError(f"Неизвестный формат хранилища: {self.store_path}")
+
+        self.signature = {"size": size, "mtime_ns": mtime_ns}
+        self.nrows = None if nrows < 0 else nrows
+
+        self._count = count
+        self._entries = HEADER.size
+        self._strings = self._entries + count * ENTRY.size
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _field(self, entry: tuple, index: int) -> Optional[str]:
+        offset, length = entry[2 * index], entry[2 * index + 1]
+
+        if length == NO_VALUE:
+            return None
+
+        start = self._strings + offset
+
+        return str(self._mm[start : start + length], "utf-8")
+
+    def __getitem__(self, position: int) -> VacancyRecord:
+        if position < 0:
+            position += self._count
+
+        if not 0 <= position < self._count:
+            raise IndexError(position)
+
+        entry = ENTRY.unpack_from(self._mm, self._entries + position * ENTRY.size)
+
+        return VacancyRecord(
+            self.source_file,
+            *(self._field(entry, index) for index in range(len(FIELDS))),
+        )
+
+    def __iter__(self) -> Iterator[VacancyRecord]:
+        for position in range(self._count):
+            yield self[position]
+
+    def column(self, field: str) -> List[Optional[str]]:
+        """
+        Получение значений одного поля всех записей без построения записей целиком
+
+        Args:
+            field (str): Имя поля из FIELDS
+
+        Returns:
+            List[Optional[str]]: Значения поля в порядке строк файла
+        """
+
+        index = FIELDS.index(field)
+
+        return [
+            self._field(entry, index)
+            for entry in ENTRY.iter_unpack(self._mm[self._entries : self._strings])
+        ]
+
+
+def load_vacancy_store(
+    csv_file: Union[str, Path],
+    store_dir: Union[str, Path],
+    nrows: Optional[int] = None,
+) -> Optional[MappedVacancyRecords]:
+    """
+    Открытие уже построенного хранилища CSV файла без чтения самого CSV файла
+
+    Args:
+        csv_file (Union[str, Path]): Путь к CSV файлу с исходными данными
+        store_dir (Union[str, Path]): Директория хранилищ
+        nrows (Optional[int]): Количество прочитанных первых строк CSV файла
+
+    Returns:
+        Optional[MappedVacancyRecords]: Записи вакансий файла или None, если хранилища нет,
+            CSV файл изменился или в хранилище прочитано другое количество строк
+    """
+
+    try:
+        records = MappedVacancyRecords(
+            Path(store_dir) / get_store_file_name(csv_file), csv_file
+        )
+    except (FileNotFoundError, ValueError, struct.error):
+        return None
+
+    if records.signature == get_file_signature(csv_file) and records.nrows == nrows:
+        return records
+
+    return None
+
+
+def open_vacancy_store(
+    csv_file: Union[str, Path],
+    df: pd.DataFrame,
+    store_dir: Union[str, Path],
+    nrows: Optional[int] = None,
+) -> MappedVacancyRecords:
+    """
+    Открытие хранилища записей CSV файла. Хранилище строится заново, только если CSV файл
+    изменился или в хранилище прочитано другое количество строк, поэтому новые процессы
+    используют уже построенные хранилища
+
+    Args:
+        csv_file (Union[str, Path]): Путь к CSV файлу с исходными данными
+        df (pd.DataFrame): Загруженный DataFrame файла (первые nrows строк)
+        store_dir (Union[str, Path]): Директория хранилищ
+        nrows (Optional[int]): Количество прочитанных первых строк CSV файла
+
+    Returns:
+        MappedVacancyRecords: Записи вакансий файла
+    """
+
+    store_dir = Path(store_dir)
+    store_dir.mkdir(parents=True, exist_ok=True)
+
+    records = load_vacancy_store(csv_file, store_dir, nrows)
+
+    if records is not None and len(records) == len(df):
+        return records
+
+    store_path = store_dir / get_store_file_name(csv_file)
+    write_vacancy_store(
+        store_path, csv_file, build_vacancy_records(csv_file, df), nrows
+    )
+
+    return MappedVacancyRecords(store_path, csv_file)
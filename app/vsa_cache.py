@@ -0,0 +1,167 @@
+"""
+File: vsa_cache.py
+Author: Dmitry Ryumin
+Description: On-disk cache of the parsed vacancies subjects association files.
+License: MIT License
+"""
+
+import os
+import json
+import hashlib
+import pandas as pd
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+# Importing necessary components for the Gradio app
+from app.utils import read_csv_file
+
+MANIFEST_NAME = "manifest.json"
+
+
+def get_file_signature(file_path: Union[str, Path]) -> Dict[str, int]:
+    """
+    Получение сигнатуры файла по его размеру и времени изменения
+
+    Args:
+        file_path (Union[str, Path]): Путь к файлу
+
+    Returns:
+        Dict[str, int]: Размер файла и время его изменения в наносекундах
+    """
+
+    stat = os.stat(file_path)
+
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _cache_file_name(file_path: Union[str, Path]) -> str:
+    digest = hashlib.sha1(str(Path(file_path).resolve()).encode("utf-8")).hexdigest()
+
+    return f"{Path(file_path).stem}.{digest[:16]}.pkl"
+
+
+def _read_manifest(cache_dir: Path) -> Dict[str, Dict]:
+    try:
+        with open(cache_dir / MANIFEST_NAME, "r", encoding="utf-8") as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def write_atomic(file_path: Path, write: Callable[[Path], Any]) -> None:
+    """
+    Атомарная запись файла: сначала во временный файл, затем замена. Временный файл
+    уникален для процесса, поэтому несколько процессов могут записывать файл одновременно
+
+    Args:
+        file_path (Path): Путь к итоговому файлу
+        write (Callable[[Path], Any]): Функция, записывающая данные по переданному пути
+    """
+
+    tmp_path = file_path.with_name(f"{file_path.name}.{os.getpid()}.tmp")
+    write(tmp_path)
+    os.replace(tmp_path, file_path)
+
+
+def _covers(cached_nrows: Optional[int], nrows: Optional[int]) -> bool:
+    # Кэш подходит, если в нем прочитан весь файл или не меньше строк, чем требуется
+    return cached_nrows is None or (nrows is not None and cached_nrows >= nrows)
+
+
+def _head(df: pd.DataFrame, nrows: Optional[int]) -> pd.DataFrame:
+    if nrows is None or len(df) <= nrows:
+        return df
+
+    # Копия не держит в памяти строки за пределами окна
+    return df.iloc[:nrows].copy()
+
+
+def load_vsa_dataframe(
+    csv_file: Union[str, Path],
+    cache_dir: Union[str, Path],
+    manifest: Dict[str, Dict],
+    nrows: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Загрузка одного CSV файла с исходными данными из кэша или его разбор с обновлением кэша
+
+    Args:
+        csv_file (Union[str, Path]): Путь к CSV файлу с исходными данными
+        cache_dir (Union[str, Path]): Директория кэша
+        manifest (Dict[str, Dict]): Манифест кэша, обновляется на месте
+        nrows (Optional[int]): Количество первых строк файла. По умолчанию - весь файл
+
+    Returns:
+        pd.DataFrame: Обработанный DataFrame
+    """
+
+    cache_dir = Path(cache_dir)
+    key = str(csv_file)
+    signature = get_file_signature(csv_file)
+    entry = manifest.get(key)
+
+    if (
+        entry is not None
+        and entry.get("signature") == signature
+        and _covers(entry.get("nrows"), nrows)
+    ):
+        try:
+            return _head(pd.read_pickle(cache_dir / entry["cache"]), nrows)
+        except (FileNotFoundError, EOFError, ValueError):
+            pass
+
+    df = read_csv_file(csv_file, nrows=nrows)
+
+    cache_name = _cache_file_name(csv_file)
+    write_atomic(cache_dir / cache_name, df.to_pickle)
+    manifest[key] = {"signature": signature, "cache": cache_name, "nrows": nrows}
+
+    return df
+
+
+def load_vsa_dataframes(
+    csv_files: List[Union[str, Path]],
+    cache_dir: Union[str, Path],
+    nrows: Optional[int] = None,
+    retain: Iterable[Union[str, Path]] = (),
+) -> List[pd.DataFrame]:
+    """
+    Загрузка CSV файлов с исходными данными с использованием кэша.
+    Заново разбираются только файлы, у которых изменились размер или время изменения,
+    а также файлы, из которых ранее было прочитано меньше nrows строк
+
+    Args:
+        csv_files (List[Union[str, Path]]): Список путей к CSV файлам с исходными данными
+        cache_dir (Union[str, Path]): Директория кэша
+        nrows (Optional[int]): Количество первых строк каждого файла. По умолчанию - весь файл
+        retain (Iterable[Union[str, Path]]): Файлы исходных данных, которые сейчас не загружаются,
+            но записи кэша которых сохраняются
+
+    Returns:
+        List[pd.DataFrame]: DataFrame в порядке csv_files
+    """
+
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    manifest = _read_manifest(cache_dir)
+    initial_manifest = json.dumps(manifest, sort_keys=True)
+
+    vsa_dataframes = [
+        load_vsa_dataframe(csv_file, cache_dir, manifest, nrows)
+        for csv_file in csv_files
+    ]
+
+    # Удаляем из кэша файлы, которых больше нет среди исходных данных
+    actual_keys = {str(csv_file) for csv_file in [*csv_files, *retain]}
+
+    for key in [key for key in manifest if key not in actual_keys]:
+        (cache_dir / manifest.pop(key)["cache"]).unlink(missing_ok=True)
+
+    if json.dumps(manifest, sort_keys=True) != initial_manifest:
+        write_atomic(
+            cache_dir / MANIFEST_NAME,
+            lambda path: path.write_text(json.dumps(manifest, indent=2), "utf-8"),
+        )
+
+    return vsa_dataframes
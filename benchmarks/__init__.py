@@ -0,0 +1,6 @@
+"""
+File: __init__.py
+Author: Dmitry Ryumin
+Description: Benchmarks of the application data path on a synthetic corpus.
+License: MIT License
+"""
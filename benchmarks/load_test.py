@@ -0,0 +1,405 @@
+"""
+File: load_test.py
+Author: Dmitry Ryumin
+Description: In-process load test of the event handlers with simulated concurrent raters.
+License: MIT License
+"""
+
+import time
+import random
+import argparse
+import tempfile
+import threading
+import statistics
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+# Importing necessary components for the Gradio app
+from app.config import config_data
+from benchmarks.synthetic_data import SIZES, CorpusSize, generate_corpus
+
+THINK_TIMES: Dict[str, Callable[[random.Random, float], float]] = {
+    "none": lambda rng, mean: 0.0,
+    "fixed": lambda rng, mean: mean,
+    "uniform": lambda rng, mean: rng.uniform(0, 2 * mean),
+    "exponential": lambda rng, mean: rng.expovariate(1 / mean) if mean else 0.0,
+}
+
+
+def configure_data_paths(data_dir: Path, backend: str) -> Dict[str, Path]:
+    """
+    Перенастройка путей к данным на временную директорию. Вызывается до импорта обработчиков,
+    так как данные приложения создаются при импорте app.data_init
+
+    Args:
+        data_dir (Path): Директория синтетического корпуса
+        backend (str): Хранилище оценок (csv или sqlite)
+
+    Returns:
+        Dict[str, Path]: Директории vsa, subjects и arena
+    """
+
+    paths = {
+        "vsa": data_dir / "vacancies_subjects_association",
+        "subjects": data_dir / "subjects",
+        "arena": data_dir / "arena",
+    }
+
+    config_data.StaticPaths_VSA = str(paths["vsa"]) + "/"
+    config_data.StaticPaths_SUBJECTS = str(paths["subjects"]) + "/"
+    config_data.StaticPaths_ARENA = str(paths["arena"]) + "/"
+    config_data.StaticPaths_VSA_CACHE = str(data_dir / "cache" / "vsa") + "/"
+    config_data.StaticPaths_SUBJECTS_CACHE = str(data_dir / "cache" / "subjects") + "/"
+    config_data.StaticPaths_VSA_STORE = str(data_dir / "cache" / "vsa_store") + "/"
+    config_data.RatingsStore_BACKEND = backend
+    config_data.RatingsStore_SQLITE_PATH = str(data_dir / "arena.sqlite3")
+    config_data.Watcher_ENABLED = False
+
+    return paths
+
+
+def get_value(component: Any) -> Any:
+    """
+    Получение значения из результата обработчика (компонент Gradio или словарь gr.update)
+    """
+
+    if isinstance(component, dict):
+        return component.get("value")
+
+    return getattr(component, "value", component)
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    """
+    Вычисление p50, p95 и p99 в миллисекундах
+
+    Args:
+        values (List[float]): Значения в секундах
+
+    Returns:
+        Dict[str, float]: Перцентили
+    """
+
+    if len(values) < 2:
+        value = values[0] * 1000 if values else 0.0
+        return {"p50": value, "p95": value, "p99": value}
+
+    cuts = statistics.quantiles(values, n=100, method="inclusive")
+
+    return {"p50": cuts[49] * 1000, "p95": cuts[94] * 1000, "p99": cuts[98] * 1000}
+
+
+class HandlerError(Exception):
+    """
+    Ошибка обработчика события, уже учтенная в отчете
+    """
+
+
+class LoadTest:
+    """
+    Имитация участников, которые входят в приложение, выбирают оценки и отправляют их.
+    Как и в Gradio, события одной группы ConcurrencyEvents выполняются не более чем
+    ConcurrencyGroups потоками одновременно. Если задан concurrency_limit, он применяется
+    к каждому обработчику вместо групп
+    """
+
+    def __init__(
+        self,
+        raters: int,
+        tabs: int,
+        ratings_per_rater: int,
+        think_time: str,
+        think_mean: float,
+        concurrency_limit: Optional[int],
+        seed: int = 0,
+    ) -> None:
+        # Обработчики импортируются только после перенастройки путей к данным
+        from app.data_init import data_context
+        from app.event_handlers.calculate_rating import event_handler_calculate_rating
+        from app.event_handlers.login import event_handler_login
+
+        self.data_context = data_context
+        self.handlers = {
+            "login": event_handler_login,
+            "calculate_rating": event_handler_calculate_rating,
+        }
+
+        self.raters = raters
+        self.tabs = tabs
+        self.ratings_per_rater = ratings_per_rater
+        self.think_time = THINK_TIMES[think_time]
+        self.think_mean = think_mean
+        self.seed = seed
+
+        if concurrency_limit is None:
+            groups = {
+                name: getattr(config_data, f"ConcurrencyEvents_{name.upper()}")
+                for name in self.handlers
+            }
+            semaphores = {
+                group: threading.BoundedSemaphore(
+                    getattr(config_data, f"ConcurrencyGroups_{group}") or 1_000_000
+                )
+                for group in set(groups.values())
+            }
+            self._slots = {name: semaphores[group] for name, group in groups.items()}
+        else:
+            self._slots = {
+                name: threading.BoundedSemaphore(concurrency_limit or 1_000_000)
+                for name in self.handlers
+            }
+
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.waits: Dict[str, List[float]] = defaultdict(list)
+        self.append_times: List[float] = []
+        self.errors: Counter = Counter()
+        self.session_errors: Counter = Counter()
+        self.submitted: Set[Tuple[str, str, str, str, str]] = set()
+        self.submits = 0
+
+    def _call(self, name: str, *args: Any) -> Any:
+        start_time = time.perf_counter()
+
+        with self._slots[name]:
+            acquired_time = time.perf_counter()
+
+            try:
+                return self.handlers[name](*args)
+            except Exception as e:
+                with self._lock:
+                    self.errors[f"{name}: {type(e).__name__}"] += 1
+                raise HandlerError(name) from e
+            finally:
+                end_time = time.perf_counter()
+
+                with self._lock:
+                    self.latencies[name].append(end_time - start_time)
+                    self.waits[name].append(acquired_time - start_time)
+
+    def _instrument_store(self) -> None:
+        ratings_store = self.data_context.ratings_store
+        append = ratings_store.append
+
+        # Время добавления оценки в хранилище показывает конкуренцию за запись
+        def timed_append(source_file: str, row: Dict[str, Any]) -> None:
+            start_time = time.perf_counter()
+            append(source_file, row)
+
+            with self._lock:
+                self.append_times.append(time.perf_counter() - start_time)
+
+        ratings_store.append = timed_append
+
+    def _session(self, rater: int, tab: int) -> None:
+        rng = random.Random(self.seed * 1_000_003 + rater * 101 + tab)
+        user = (f"Фамилия{rater}", f"Имя{rater}", config_data.Settings_DROPDOWN_USER[0])
+
+        outputs = self._call("login", *user)
+        csv_vsa_file, vacancy_id = get_value(outputs[7]), get_value(outputs[8])
+        evaluation_queue = get_value(outputs[-1])
+
+        for _ in range(self.ratings_per_rater):
+            # Пользователю больше нечего оценивать
+            if not csv_vsa_file:
+                break
+
+            time.sleep(self.think_time(rng, self.think_mean))
+
+            rating_a = rng.randint(1, config_data.Settings_RATING_SCALE)
+            rating_b = rng.randint(1, config_data.Settings_RATING_SCALE)
+
+            with self._lock:
+                self.submitted.add(user + (Path(csv_vsa_file).name, str(vacancy_id)))
+                self.submits += 1
+
+            outputs = self._call(
+                "calculate_rating",
+                *user,
+                csv_vsa_file,
+                str(vacancy_id),
+                rating_a,
+                rating_b,
+                evaluation_queue,
+            )
+
+            csv_vsa_file, vacancy_id = get_value(outputs[0]), get_value(outputs[1])
+            evaluation_queue = get_value(outputs[-1])
+
+    def _run_session(self, rater: int, tab: int) -> None:
+        try:
+            self._session(rater, tab)
+        except HandlerError:
+            # Ошибка обработчика уже учтена в _call
+            pass
+        except Exception as e:
+            with self._lock:
+                self.session_errors[type(e).__name__] += 1
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Запуск имитации и проверка сохраненных оценок
+
+        Returns:
+            Dict[str, Any]: Отчет нагрузочного тестирования
+        """
+
+        self.data_context.start()
+        if not self.data_context.wait_ready():
+            raise RuntimeError(f"Данные не загружены: {self.data_context.error}")
+
+        self._instrument_store()
+
+        threads = [
+            threading.Thread(target=self._run_session, args=(rater, tab), daemon=True)
+            for rater in range(self.raters)
+            for tab in range(self.tabs)
+        ]
+
+        start_time = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start_time
+
+        self.data_context.ratings_store.flush()
+
+        stored = Counter(
+            (
+                str(row.get("SURNAME")),
+                str(row.get("USERNAME")),
+                str(row.get("AFFILIATION")),
+                source_file,
+                str(row.get("ID")),
+            )
+            for source_file, row in self.data_context.ratings_store.iter_ratings()
+        )
+
+        return {
+            "sessions": len(threads),
+            "elapsed_s": elapsed,
+            "submits": self.submits,
+            "throughput_per_s": self.submits / elapsed if elapsed else 0.0,
+            "latency_ms": {
+                name: percentiles(values) for name, values in self.latencies.items()
+            },
+            "queue_wait_ms": {
+                name: percentiles(values) for name, values in self.waits.items()
+            },
+            "store_append_ms": percentiles(self.append_times),
+            "stored_rows": sum(stored.values()),
+            "duplicate_rows": sum(count - 1 for count in stored.values() if count > 1),
+            "lost_rows": len(self.submitted - set(stored)),
+            "coverage": self.data_context.scheduler.coverage(),
+            "render_cache": self.data_context.render_cache.stats(),
+            "errors": dict(self.errors),
+            "session_errors": dict(self.session_errors),
+        }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(
+        f"Сессий: {report['sessions']}, оценок: {report['submits']}, "
+        f"время: {report['elapsed_s']:.2f} с, "
+        f"пропускная способность: {report['throughput_per_s']:.1f} оценок/с"
+    )
+
+    for title, key in (
+        ("Задержка", "latency_ms"),
+        ("Ожидание очереди", "queue_wait_ms"),
+    ):
+        for name, values in report[key].items():
+            print(
+                f"{title:<17} {name:<17} "
+                + " ".join(f"{p}={value:8.2f} мс" for p, value in values.items())
+            )
+
+    print(
+        "Запись в хранилище         "
+        + " ".join(
+            f"{p}={value:8.2f} мс" for p, value in report["store_append_ms"].items()
+        )
+    )
+    print(
+        f"Сохранено строк: {report['stored_rows']}, "
+        f"дубликатов: {report['duplicate_rows']}, потеряно: {report['lost_rows']}"
+    )
+
+    print(f"Покрытие вакансий: {report['coverage']}")
+    print(f"Кэш подготовленных вакансий: {report['render_cache']}")
+
+    if report["errors"]:
+        print(f"Ошибки: {report['errors']}")
+
+    if report["session_errors"]:
+        print(f"Ошибки сессий вне обработчиков: {report['session_errors']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Нагрузочное тестирование обработчиков событий без браузера и сети"
+    )
+    parser.add_argument("--size", choices=list(SIZES), default="small")
+    parser.add_argument("--raters", type=int, default=20)
+    parser.add_argument(
+        "--tabs", type=int, default=1, help="Одновременных вкладок у участника"
+    )
+    parser.add_argument("--ratings-per-rater", type=int, default=20)
+    parser.add_argument(
+        "--think-time", choices=list(THINK_TIMES), default="exponential"
+    )
+    parser.add_argument("--think-mean", type=float, default=0.05)
+    parser.add_argument(
+        "--concurrency-limit",
+        type=int,
+        default=None,
+        help="Одновременных вызовов одного обработчика (0 - без ограничения). "
+        "По умолчанию - группы из config.toml",
+    )
+    parser.add_argument("--backend", choices=["csv", "sqlite"], default="csv")
+    parser.add_argument(
+        "--scheduler",
+        choices=["round_robin", "coverage", "uncertainty"],
+        default=config_data.Scheduler_MODE,
+    )
+    parser.add_argument(
+        "--prefetch",
+        action=argparse.BooleanOptionalAction,
+        default=config_data.Prefetch_ENABLED,
+        help="Упреждающая подготовка следующей вакансии",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        size = SIZES[args.size]
+        # Оценки в корпусе не генерируются: все оценки выставляются во время теста
+        generate_corpus(
+            tmp_dir,
+            CorpusSize(
+                vacancies=size.vacancies,
+                files=size.files,
+                subjects=size.subjects,
+                raters=0,
+                ratings=0,
+            ),
+            args.seed,
+        )
+        configure_data_paths(Path(tmp_dir), args.backend)
+        config_data.Scheduler_MODE = args.scheduler
+        config_data.Prefetch_ENABLED = args.prefetch
+
+        report = LoadTest(
+            raters=args.raters,
+            tabs=args.tabs,
+            ratings_per_rater=args.ratings_per_rater,
+            think_time=args.think_time,
+            think_mean=args.think_mean,
+            concurrency_limit=args.concurrency_limit,
+            seed=args.seed,
+        ).run()
+
+        print_report(report)
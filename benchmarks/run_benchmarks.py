@@ -0,0 +1,255 @@
+"""
+File: run_benchmarks.py
+Author: Dmitry Ryumin
+Description: Time and peak memory benchmarks of the data path utilities with JSON baselines.
+License: MIT License
+"""
+
+import gc
+import json
+import time
+import argparse
+import platform
+import tempfile
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Importing necessary components for the Gradio app
+from app.config import config_data
+from app.rating_utils import count_rows_to_evaluate, get_evaluation_queue
+from app.ratings_ledger import RatingsLedger
+from app.utils import (
+    directory_listing_cache,
+    get_csv_files,
+    load_excel_files,
+    parse_course_data,
+    read_csv_file,
+    wrap_subjects,
+)
+from benchmarks.synthetic_data import SIZES, generate_corpus
+
+BASELINES_DIR = Path(__file__).parent / "baselines"
+
+
+def measure(function: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """
+    Замер времени выполнения (лучшее и среднее из repeat запусков) и пикового объема памяти
+
+    Args:
+        function (Callable[[], Any]): Измеряемая функция без аргументов
+        repeat (int): Количество запусков для замера времени
+
+    Returns:
+        Dict[str, float]: Время в секундах и пиковый объем памяти в мегабайтах
+    """
+
+    timings = []
+
+    for _ in range(repeat):
+        gc.collect()
+        start_time = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start_time)
+
+    # Память замеряется отдельным запуском, так как tracemalloc замедляет выполнение
+    gc.collect()
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "best_s": min(timings),
+        "mean_s": sum(timings) / len(timings),
+        "peak_mb": peak / 2**20,
+    }
+
+
+def build_cases(paths: Dict[str, Path]) -> List[Tuple[str, Callable[[], Any]]]:
+    """
+    Подготовка измеряемых функций на синтетическом корпусе
+
+    Args:
+        paths (Dict[str, Path]): Директории vsa, subjects и arena
+
+    Returns:
+        List[Tuple[str, Callable[[], Any]]]: Название и функция без аргументов
+    """
+
+    csv_files = get_csv_files(paths["vsa"])
+    vsa_dataframes = [read_csv_file(csv_file) for csv_file in csv_files]
+    unique_subjects = set(
+        load_excel_files(paths["subjects"])[config_data.DataframeHeaders_RU_SUBJECT]
+        .dropna()
+        .astype(str)
+        .str.lower()
+    )
+
+    course_data_a = [
+        value
+        for df in vsa_dataframes
+        for value in df[df.columns[7]].fillna("").astype(str).tolist()
+    ]
+    parsed_a = [parse_course_data(value, [2, 3]) for value in course_data_a]
+
+    ratings_ledger = RatingsLedger()
+    for ratings_file in get_csv_files(paths["arena"]):
+        ratings_ledger.add_rows(
+            ratings_file.name,
+            read_csv_file(ratings_file).to_dict(orient="records"),
+        )
+
+    rater = ("Фамилия0", "Имя0", config_data.Settings_DROPDOWN_USER[0])
+
+    def get_csv_files_cold() -> List[Path]:
+        directory_listing_cache.invalidate()
+        return get_csv_files(paths["arena"])
+
+    return [
+        (
+            "parse_course_data",
+            lambda: [parse_course_data(value, [2, 3]) for value in course_data_a],
+        ),
+        (
+            "wrap_subjects",
+            lambda: [wrap_subjects(parsed, unique_subjects) for parsed in parsed_a],
+        ),
+        (
+            "read_csv_file",
+            lambda: [read_csv_file(csv_file) for csv_file in csv_files],
+        ),
+        (
+            "read_csv_file_limit",
+            lambda: [
+                read_csv_file(csv_file, nrows=config_data.Settings_EVALUATE_LIMIT)
+                for csv_file in csv_files
+            ],
+        ),
+        ("get_csv_files_cold", get_csv_files_cold),
+        ("get_csv_files", lambda: get_csv_files(paths["arena"])),
+        ("load_excel_files", lambda: load_excel_files(paths["subjects"])),
+        (
+            "get_evaluation_queue",
+            lambda: get_evaluation_queue(
+                csv_files,
+                vsa_dataframes,
+                ratings_ledger,
+                config_data.Settings_EVALUATE_LIMIT,
+                *rater,
+            ),
+        ),
+        (
+            "count_rows_to_evaluate",
+            lambda: count_rows_to_evaluate(
+                csv_files,
+                vsa_dataframes,
+                ratings_ledger,
+                config_data.Settings_EVALUATE_LIMIT,
+                *rater,
+            ),
+        ),
+    ]
+
+
+def run(
+    sizes: List[str], repeat: int, data_dir: Optional[Path] = None
+) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """
+    Запуск всех замеров для каждого размера корпуса
+
+    Args:
+        sizes (List[str]): Размеры корпуса из SIZES
+        repeat (int): Количество запусков для замера времени
+        data_dir (Optional[Path]): Директория для корпусов. По умолчанию - временная
+
+    Returns:
+        Dict[str, Dict[str, Dict[str, float]]]: Размер корпуса -> функция -> результаты
+    """
+
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in sizes:
+            corpus_dir = Path(data_dir or tmp_dir) / size
+
+            if not (corpus_dir / "arena").is_dir():
+                generate_corpus(corpus_dir, SIZES[size])
+
+            paths = {
+                name: corpus_dir / path
+                for name, path in (
+                    ("vsa", "vacancies_subjects_association"),
+                    ("subjects", "subjects"),
+                    ("arena", "arena"),
+                )
+            }
+
+            results[size] = {}
+            for name, function in build_cases(paths):
+                results[size][name] = measure(function, repeat)
+                print(
+                    f"{size:>8} {name:<22} "
+                    f"{results[size][name]['best_s'] * 1000:>10.2f} мс "
+                    f"{results[size][name]['peak_mb']:>9.2f} МБ"
+                )
+
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, Dict[str, float]]],
+    baseline: Dict[str, Dict[str, Dict[str, float]]],
+) -> None:
+    """
+    Вывод отношения текущих результатов к сохраненным
+
+    Args:
+        results (Dict[str, Dict[str, Dict[str, float]]]): Текущие результаты
+        baseline (Dict[str, Dict[str, Dict[str, float]]]): Сохраненные результаты
+    """
+
+    for size, functions in results.items():
+        for name, current in functions.items():
+            previous = baseline.get(size, {}).get(name)
+
+            if previous is None:
+                continue
+
+            print(
+                f"{size:>8} {name:<22} "
+                f"время x{current['best_s'] / max(previous['best_s'], 1e-9):.2f} "
+                f"память x{current['peak_mb'] / max(previous['peak_mb'], 1e-9):.2f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Замеры времени и памяти функций обработки данных"
+    )
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=["small"])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--data-dir", type=Path, default=None)
+    parser.add_argument("--save", help="Имя файла результатов в benchmarks/baselines")
+    parser.add_argument("--compare", help="Имя файла результатов для сравнения")
+
+    args = parser.parse_args()
+    results = run(args.sizes, args.repeat, args.data_dir)
+
+    if args.compare:
+        with open(BASELINES_DIR / args.compare, "r", encoding="utf-8") as file:
+            compare(results, json.load(file)["results"])
+
+    if args.save:
+        BASELINES_DIR.mkdir(parents=True, exist_ok=True)
+        with open(BASELINES_DIR / args.save, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "repeat": args.repeat,
+                    "results": results,
+                },
+                file,
+                indent=2,
+            )
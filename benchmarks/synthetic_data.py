@@ -0,0 +1,182 @@
+"""
+File: synthetic_data.py
+Author: Dmitry Ryumin
+Description: Generator of a synthetic corpus: vacancies, subject workbooks and arena ratings.
+License: MIT License
+"""
+
+import csv
+import random
+import argparse
+import pandas as pd
+from pathlib import Path
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Union
+
+# Importing necessary components for the Gradio app
+from app.config import config_data
+from app.rating_writer import RATING_COLUMNS
+
+VSA_COLUMNS = ["ID", "Name", "Description", "KeySkills", "Area", "Employer", "B", "A"]
+
+FILE_PREFIXES = ["Analyst", "Аналитик", "1C", "Developer", "Разработчик", "3D"]
+
+
+@dataclass(frozen=True)
+class CorpusSize:
+    """
+    Параметры синтетического корпуса
+    """
+
+    vacancies: int
+    files: int
+    subjects: int
+    raters: int
+    ratings: int
+    courses_per_vacancy: int = 10
+
+
+SIZES: Dict[str, CorpusSize] = {
+    "small": CorpusSize(vacancies=500, files=5, subjects=500, raters=20, ratings=5_000),
+    "medium": CorpusSize(
+        vacancies=2_000, files=10, subjects=2_000, raters=200, ratings=100_000
+    ),
+    "large": CorpusSize(
+        vacancies=10_000, files=20, subjects=5_000, raters=1_000, ratings=1_000_000
+    ),
+}
+
+
+def get_file_names(files: int) -> List[str]:
+    """
+    Формирование имен CSV файлов с английскими, русскими и цифровыми префиксами
+
+    Args:
+        files (int): Количество файлов
+
+    Returns:
+        List[str]: Имена файлов
+    """
+
+    return [f"{FILE_PREFIXES[i % len(FILE_PREFIXES)]}_{i}.csv" for i in range(files)]
+
+
+def generate_corpus(
+    output_dir: Union[str, Path], size: CorpusSize, seed: int = 0
+) -> Dict[str, Path]:
+    """
+    Генерация синтетического корпуса в формате исходных данных приложения
+
+    Args:
+        output_dir (Union[str, Path]): Директория корпуса
+        size (CorpusSize): Параметры корпуса
+        seed (int): Начальное значение генератора случайных чисел
+
+    Returns:
+        Dict[str, Path]: Директории vsa, subjects и arena
+    """
+
+    rng = random.Random(seed)
+    output_dir = Path(output_dir)
+    paths = {
+        "vsa": output_dir / "vacancies_subjects_association",
+        "subjects": output_dir / "subjects",
+        "arena": output_dir / "arena",
+    }
+
+    for path in paths.values():
+        path.mkdir(parents=True, exist_ok=True)
+
+    # Часть рекомендованных дисциплин отсутствует в справочнике
+    subjects = [f"Дисциплина {i}" for i in range(size.subjects)]
+    catalog = subjects[: int(size.subjects * 0.8)]
+
+    half = len(catalog) // 2
+    for i, part in enumerate([catalog[:half], catalog[half:]]):
+        pd.DataFrame({config_data.DataframeHeaders_RU_SUBJECT: part}).to_excel(
+            paths["subjects"] / f"subjects_{i}.xlsx", index=False
+        )
+
+    file_names = get_file_names(size.files)
+    vacancies_per_file = max(1, size.vacancies // size.files)
+
+    for file_name in file_names:
+        with open(
+            paths["vsa"] / file_name, "w", encoding="utf-8-sig", newline=""
+        ) as file:
+            writer = csv.writer(file, delimiter=";")
+            writer.writerow(VSA_COLUMNS)
+
+            for vacancy_id in range(1, vacancies_per_file + 1):
+                courses = rng.sample(subjects, size.courses_per_vacancy)
+                writer.writerow(
+                    [
+                        vacancy_id,
+                        f"{Path(file_name).stem} {vacancy_id}",
+                        f"<p>Описание вакансии {vacancy_id}</p>" * 20,
+                        (
+                            ", ".join(rng.sample(["SQL", "Python", "Git", "Excel"], 2))
+                            if vacancy_id % 4
+                            else ""
+                        ),
+                        "Москва",
+                        "Работодатель",
+                        "CS=" + ";".join(rng.sample(subjects, len(courses))),
+                        "CS="
+                        + ";".join(
+                            f"{rank}|{course}|{rng.random():.4f}"
+                            for rank, course in enumerate(courses, 1)
+                        ),
+                    ]
+                )
+
+    # Каждый участник оценивает разные вакансии, распределенные по файлам
+    ratings_per_rater = min(
+        size.ratings // max(1, size.raters), vacancies_per_file * size.files
+    )
+    vacancy_keys = [
+        (file_name, vacancy_id)
+        for file_name in file_names
+        for vacancy_id in range(1, vacancies_per_file + 1)
+    ]
+    rows_by_file: Dict[str, List[List]] = {file_name: [] for file_name in file_names}
+
+    for rater in range(size.raters):
+        for file_name, vacancy_id in rng.sample(vacancy_keys, ratings_per_rater):
+            rows_by_file[file_name].append(
+                [
+                    vacancy_id,
+                    f"Фамилия{rater}",
+                    f"Имя{rater}",
+                    config_data.Settings_DROPDOWN_USER[
+                        rater % len(config_data.Settings_DROPDOWN_USER)
+                    ],
+                    rng.randint(1, config_data.Settings_RATING_SCALE),
+                    rng.randint(1, config_data.Settings_RATING_SCALE),
+                ]
+            )
+
+    for file_name, rows in rows_by_file.items():
+        with open(
+            paths["arena"] / file_name, "w", encoding="utf-8-sig", newline=""
+        ) as file:
+            writer = csv.writer(file, delimiter=";", lineterminator="\n")
+            writer.writerow(RATING_COLUMNS)
+            writer.writerows(rows)
+
+    return paths
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Генерация синтетического корпуса")
+    parser.add_argument("output_dir")
+    parser.add_argument("--size", choices=list(SIZES), default="small")
+    parser.add_argument("--seed", type=int, default=0)
+
+    args = parser.parse_args()
+
+    print(f"Параметры корпуса: {asdict(SIZES[args.size])}")
+    for name, path in generate_corpus(
+        args.output_dir, SIZES[args.size], args.seed
+    ).items():
+        print(f"{name}: {path}")